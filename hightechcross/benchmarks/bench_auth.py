@@ -0,0 +1,65 @@
+"""Reports the queries and the latency per request of token authenticated team requests,
+with the plain DRF TokenAuthentication and with the cached one.
+
+    python benchmarks/bench_auth.py --teams 200 --requests 2000
+"""
+import argparse
+import random
+import time
+
+from common import create_cross, create_database, create_teams, destroy_database, report_latency
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework.authentication import SessionAuthentication, TokenAuthentication
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APIClient
+
+from shared.authentication import CachedTokenAuthentication
+from tournament.views import TaskViewSet
+
+
+def run(name, authentication_class, clients, requests):
+    TaskViewSet.authentication_classes = [SessionAuthentication, authentication_class]
+    url = reverse('task-list')
+    rng = random.Random(name)
+    samples = []
+    queries = 0
+    for _ in range(requests):
+        client = rng.choice(clients)
+        with CaptureQueriesContext(connection) as context:
+            start = time.perf_counter()
+            response = client.get(url)
+            samples.append(time.perf_counter() - start)
+        assert response.status_code == 200, response.content
+        queries += len(context.captured_queries)
+    report_latency(name, samples)
+    print(f'{name}: {queries / requests:.2f} queries per request')
+    return queries / requests
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--teams', type=int, default=200)
+    parser.add_argument('--tasks', type=int, default=20)
+    parser.add_argument('--requests', type=int, default=2000)
+    args = parser.parse_args()
+
+    old_name = create_database()
+    try:
+        create_cross(args.tasks)
+        clients = []
+        for team in create_teams(args.teams):
+            client = APIClient()
+            client.credentials(HTTP_AUTHORIZATION=f'Token {Token.objects.create(user=team).key}')
+            clients.append(client)
+
+        plain = run('token', TokenAuthentication, clients, args.requests)
+        cached = run('cached token', CachedTokenAuthentication, clients, args.requests)
+        print(f'saved {plain - cached:.2f} queries per request')
+    finally:
+        destroy_database(old_name)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,31 @@
+"""Compares the submit throughput of the database profiles, each measured in its own process.
+
+    python benchmarks/bench_db_profiles.py --profiles sqlite sqlite-tuned postgresql -- --teams 200 --workers 16
+
+Arguments after ``--`` are passed to bench_submit.py. The postgresql profile reads the
+DATABASE_* variables described in hightechcross/settings.py.
+"""
+import argparse
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+PROFILES = ('sqlite', 'sqlite-tuned', 'postgresql')
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--profiles', nargs='+', choices=PROFILES, default=['sqlite', 'sqlite-tuned'])
+    parser.add_argument('submit_args', nargs='*', help='Arguments of bench_submit.py')
+    args = parser.parse_args()
+
+    bench_submit = Path(__file__).resolve().parent / 'bench_submit.py'
+    for profile in args.profiles:
+        print(f'{profile}:', flush=True)
+        subprocess.run([sys.executable, str(bench_submit), *args.submit_args],
+                       env={**os.environ, 'DATABASE_PROFILE': profile}, check=True)
+
+
+if __name__ == '__main__':
+    main()
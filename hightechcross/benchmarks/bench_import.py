@@ -0,0 +1,60 @@
+"""Reports rows/sec of cross creation: one task per INSERT versus the batched import endpoint.
+
+    python benchmarks/bench_import.py --crosses 20 --tasks 500
+"""
+import argparse
+import json
+
+from common import create_database, destroy_database, report_throughput, timed
+from django.db import transaction
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from tournament.models import Cross, Task, User
+
+
+def cross_data(number, tasks_count):
+    return {'tasks': [{'name': f'cross{number}-task{i}', 'coordinates': f'{i}, {i}', 'description': 'description',
+                       'correct_answer': 'answer', 'hint1': 'hint1', 'hint2': 'hint2', 'hint3': 'hint3'}
+                      for i in range(tasks_count)]}
+
+
+@transaction.atomic
+def create_row_by_row(crosses):
+    for cross in crosses:
+        db_cross = Cross.objects.create()
+        for task in cross['tasks']:
+            Task.objects.create(**task, cross=db_cross)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--crosses', type=int, default=20)
+    parser.add_argument('--tasks', type=int, default=500, help='Tasks per cross')
+    args = parser.parse_args()
+
+    old_name = create_database()
+    try:
+        client = APIClient()
+        client.force_authenticate(User.objects.create_user(username='admin', is_staff=True))
+        crosses = [cross_data(i, args.tasks) for i in range(args.crosses)]
+        rows = args.crosses * (args.tasks + 1)
+
+        _, seconds = timed(create_row_by_row, crosses)
+        report_throughput('row by row', rows, seconds)
+
+        response, seconds = timed(client.post, reverse('cross-import-crosses'), crosses, format='json')
+        assert response.status_code == 201, response.content
+        report_throughput('import endpoint (JSON)', rows, seconds)
+
+        body = ''.join(json.dumps(cross) + '\n' for cross in crosses)
+        response, seconds = timed(client.post, reverse('cross-import-crosses'), body,
+                                  content_type='application/x-ndjson')
+        assert response.status_code == 201, response.content
+        report_throughput('import endpoint (NDJSON)', rows, seconds)
+    finally:
+        destroy_database(old_name)
+
+
+if __name__ == '__main__':
+    main()
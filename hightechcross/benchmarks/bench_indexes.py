@@ -0,0 +1,114 @@
+"""Reports p50/p99 latency of the hot tournament endpoints without and with the Answer indexes of 0005,
+which 0009 dropped again.
+
+    python benchmarks/bench_indexes.py --answers 1000000 --teams 1000 --tasks 100
+"""
+import argparse
+import random
+import time
+
+from common import (create_cross, create_database, create_teams, destroy_database,
+                    report_latency)
+from django.core.cache import cache
+from django.db import connection, models
+from django.test import Client
+from django.urls import reverse
+
+from tournament.models import Answer, User
+from tournament.standings import rebuild_standings
+
+BATCH_SIZE = 10000
+# The indexes added by 0005_hot_query_indexes and removed by 0009_drop_answer_indexes
+HOT_QUERY_INDEXES = (
+    models.Index(fields=['task', 'team', 'is_correct'], name='answer_task_team_correct_idx'),
+    models.Index(fields=['task', 'team'], condition=models.Q(is_correct=True), name='answer_correct_idx'),
+)
+
+
+def seed_answers(db_cross, teams, answers_count):
+    db_tasks = list(db_cross.tasks.all())
+    per_pair = max(1, answers_count // (len(teams) * len(db_tasks)))
+    batch = []
+    for team in teams:
+        for db_task in db_tasks:
+            for i in range(per_pair):
+                solved = i == per_pair - 1 and (team.id + db_task.id) % 2 == 0
+                answer = db_task.correct_answer if solved else f'wrong{i}'
+                batch.append(Answer(team=team, task=db_task, is_correct=solved, answer=answer, answer_key=answer))
+                if len(batch) == BATCH_SIZE:
+                    Answer.objects.bulk_create(batch)
+                    batch = []
+    Answer.objects.bulk_create(batch)
+    rebuild_standings(db_cross)
+
+
+def add_indexes():
+    with connection.schema_editor() as schema_editor:
+        for index in HOT_QUERY_INDEXES:
+            schema_editor.add_index(Answer, index)
+
+
+def measure(name, requests, client_for, method, url_for):
+    samples = []
+    for i in range(requests):
+        client = client_for(i)
+        url = url_for(i)
+        cache.clear()
+        start = time.perf_counter()
+        response = getattr(client, method)(url)
+        samples.append(time.perf_counter() - start)
+        assert response.status_code == 200, response.content
+    report_latency(name, samples)
+
+
+def run(label, db_cross, clients, admin_client, requests):
+    db_task_ids = list(db_cross.tasks.values_list('id', flat=True))
+    rng = random.Random(label)
+    measure(f'{label}: submit', requests, lambda i: rng.choice(clients), 'post',
+            lambda i: reverse('task-submit', args=[rng.choice(db_task_ids)]) + f'?answer={label}{i}')
+    measure(f'{label}: task list', requests, lambda i: rng.choice(clients), 'get',
+            lambda i: reverse('task-list'))
+    measure(f'{label}: results', max(1, requests // 10), lambda i: admin_client, 'get',
+            lambda i: reverse('cross-results', args=[db_cross.id]))
+
+    # The only query filtering answers by is_correct, run when the standings are rebuilt from the history
+    samples = []
+    for _ in range(max(1, requests // 20)):
+        start = time.perf_counter()
+        rebuild_standings(db_cross)
+        samples.append(time.perf_counter() - start)
+    report_latency(f'{label}: standings rebuild', samples)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--answers', type=int, default=1000000)
+    parser.add_argument('--teams', type=int, default=1000)
+    parser.add_argument('--tasks', type=int, default=100)
+    parser.add_argument('--requests', type=int, default=200, help='Requests measured per endpoint')
+    parser.add_argument('--clients', type=int, default=50, help='Teams sending the measured requests')
+    args = parser.parse_args()
+
+    old_name = create_database()
+    try:
+        db_cross = create_cross(args.tasks)
+        teams = create_teams(args.teams)
+        seed_answers(db_cross, teams, args.answers)
+
+        clients = []
+        for team in teams[:args.clients]:
+            client = Client()
+            client.force_login(team)
+            clients.append(client)
+        admin_client = Client()
+        admin_client.force_login(User.objects.create_user(username='admin', is_staff=True))
+
+        run('without', db_cross, clients, admin_client, args.requests)
+        add_indexes()
+        run('with', db_cross, clients, admin_client, args.requests)
+    finally:
+        destroy_database(old_name)
+
+
+if __name__ == '__main__':
+    main()
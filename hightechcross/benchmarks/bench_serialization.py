@@ -0,0 +1,48 @@
+"""Compares serialization time of a large cross: ModelSerializer + JSONRenderer versus
+values() projections + FastJSONRenderer.
+
+    python benchmarks/bench_serialization.py --tasks 500 --rounds 50
+"""
+import argparse
+
+from common import create_cross, create_database, destroy_database, report_throughput, timed
+from rest_framework.renderers import JSONRenderer
+
+from tournament.models import Cross
+from tournament.projections import CROSS_COLUMNS, project_crosses
+from tournament.renderers import FastJSONRenderer, orjson
+from tournament.serializers import CrossSerializer
+
+
+def with_serializers(cross_id, rounds):
+    for _ in range(rounds):
+        db_cross = Cross.objects.prefetch_related('tasks').get(pk=cross_id)
+        JSONRenderer().render(CrossSerializer(db_cross).data)
+
+
+def with_projections(cross_id, rounds):
+    for _ in range(rounds):
+        rows = list(Cross.objects.filter(pk=cross_id).values(*CROSS_COLUMNS))
+        FastJSONRenderer().render(project_crosses(rows)[0])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--tasks', type=int, default=500)
+    parser.add_argument('--rounds', type=int, default=50)
+    args = parser.parse_args()
+
+    old_name = create_database()
+    try:
+        cross_id = create_cross(args.tasks, started=False).id
+        _, seconds = timed(with_serializers, cross_id, args.rounds)
+        report_throughput('ModelSerializer + JSONRenderer', args.rounds, seconds)
+        _, seconds = timed(with_projections, cross_id, args.rounds)
+        renderer = 'orjson' if orjson else 'json fallback'
+        report_throughput(f'projection + FastJSONRenderer ({renderer})', args.rounds, seconds)
+    finally:
+        destroy_database(old_name)
+
+
+if __name__ == '__main__':
+    main()
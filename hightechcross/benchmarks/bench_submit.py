@@ -0,0 +1,81 @@
+"""Compares the throughput of the sync (WSGI-style thread pool) and async submit endpoints.
+
+    python benchmarks/bench_submit.py --teams 500 --answers 4 --workers 32
+"""
+import argparse
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from common import create_cross, create_database, create_teams, destroy_database, report_throughput
+from django.test import AsyncClient, Client
+from django.urls import reverse
+
+
+def answers_for(db_task, count):
+    return [f'wrong{i}' for i in range(count - 1)] + [db_task.correct_answer]
+
+
+def run_sync(teams, db_task, answers, workers):
+    url = reverse('task-submit', args=[db_task.id])
+
+    def play(team):
+        client = Client()
+        client.force_login(team)
+        return client
+
+    clients = [play(team) for team in teams]
+
+    def submit_all(client):
+        for answer in answers_for(db_task, answers):
+            assert client.post(f'{url}?answer={answer}').status_code == 200
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        list(executor.map(submit_all, clients))
+    return time.perf_counter() - start
+
+
+def run_async(teams, db_task, answers):
+    url = reverse('async-task-submit', args=[db_task.id])
+    clients = []
+    for team in teams:
+        client = AsyncClient()
+        client.force_login(team)
+        clients.append(client)
+
+    async def submit_all(client):
+        for answer in answers_for(db_task, answers):
+            assert (await client.post(f'{url}?answer={answer}')).status_code == 200
+
+    async def main():
+        await asyncio.gather(*(submit_all(client) for client in clients))
+
+    start = time.perf_counter()
+    asyncio.run(main())
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--teams', type=int, default=500)
+    parser.add_argument('--answers', type=int, default=4, help='Answers submitted by every team')
+    parser.add_argument('--workers', type=int, default=32, help='Threads serving the sync endpoint')
+    args = parser.parse_args()
+
+    old_name = create_database()
+    try:
+        db_task = create_cross(1).tasks.get()
+        requests = args.teams * args.answers
+
+        seconds = run_sync(create_teams(args.teams, 'sync'), db_task, args.answers, args.workers)
+        report_throughput(f'sync submit ({args.workers} threads)', requests, seconds)
+
+        seconds = run_async(create_teams(args.teams, 'async'), db_task, args.answers)
+        report_throughput(f'async submit ({args.teams} tasks)', requests, seconds)
+    finally:
+        destroy_database(old_name)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,80 @@
+"""Shared setup of the benchmarks.
+
+Every benchmark runs against a throwaway test database created from the configured
+``default`` database (a temporary SQLite file unless another engine is configured),
+so it never touches the development data.
+"""
+import datetime
+import os
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import django
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(BASE_DIR))
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'hightechcross.settings')
+django.setup()
+
+from django.conf import settings  # noqa: E402
+from django.contrib.auth.models import Group, User  # noqa: E402
+from django.db import connection  # noqa: E402
+from django.test.utils import setup_test_environment  # noqa: E402
+
+from tournament.answers import save_answer_keys  # noqa: E402
+from tournament.models import Cross, StatusChoice, Task  # noqa: E402
+
+
+def create_database():
+    setup_test_environment()
+    database = settings.DATABASES['default']
+    if database['ENGINE'] == 'django.db.backends.sqlite3':
+        database.setdefault('TEST', {})['NAME'] = os.path.join(tempfile.mkdtemp(), 'benchmark.sqlite3')
+        database.setdefault('OPTIONS', {}).setdefault('timeout', 60)
+    return connection.creation.create_test_db(verbosity=0)
+
+
+def destroy_database(old_name):
+    connection.creation.destroy_test_db(old_name, verbosity=0)
+
+
+def create_teams(count, prefix='team'):
+    group, _ = Group.objects.get_or_create(name='user')
+    teams = User.objects.bulk_create([User(username=f'{prefix}{i}') for i in range(count)])
+    group.user_set.add(*teams)
+    return list(User.objects.filter(username__startswith=prefix).order_by('id'))
+
+
+def create_cross(tasks_count, started=True):
+    db_cross = Cross.objects.create()
+    save_answer_keys(Task.objects.bulk_create([
+        Task(cross=db_cross, name=f'task{i}', coordinates=f'{i}, {i}', description=f'description{i}',
+             correct_answer=f'answer{i}', hint1=f'hint{i}-1', hint2=f'hint{i}-2', hint3=f'hint{i}-3')
+        for i in range(tasks_count)
+    ]))
+    if started:
+        db_cross.start_time = datetime.datetime.now(tz=datetime.timezone.utc)
+        db_cross.end_time = db_cross.start_time + datetime.timedelta(days=1)
+        db_cross.status = StatusChoice.STARTED
+        db_cross.save()
+    return db_cross
+
+
+def report_throughput(name, operations, seconds):
+    print(f'{name:<40} {operations:>9} ops {seconds:>9.3f} s {operations / seconds:>12.1f} ops/s')
+
+
+def report_latency(name, samples):
+    samples = sorted(samples)
+    p50 = statistics.median(samples) * 1000
+    p99 = samples[min(len(samples) - 1, int(len(samples) * 0.99))] * 1000
+    print(f'{name:<40} {len(samples):>9} req  p50 {p50:>9.3f} ms  p99 {p99:>9.3f} ms')
+
+
+def timed(func, *args, **kwargs):
+    start = time.perf_counter()
+    result = func(*args, **kwargs)
+    return result, time.perf_counter() - start
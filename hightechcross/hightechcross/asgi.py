@@ -2,6 +2,9 @@
 ASGI config for hightechcross project.
 
 It exposes the ASGI callable as a module-level variable named ``application``.
+The live streams (``/api/crosses/<id>/stream/`` and ``/api/tasks/stream/``) keep
+connections open without holding a worker thread only when served through it,
+e.g. ``uvicorn hightechcross.asgi:application``.
 
 For more information on this file, see
 https://docs.djangoproject.com/en/3.2/howto/deployment/asgi/
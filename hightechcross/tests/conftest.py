@@ -0,0 +1,79 @@
+import datetime
+
+import pytest
+import pytz
+from django.conf import settings
+from django.contrib.auth.models import Group, User
+from django.core.cache import cache
+from rest_framework.test import APIClient
+
+from tournament.models import Cross, StatusChoice, Task
+
+
+@pytest.fixture(scope='session')
+def django_db_modify_db_settings(tmp_path_factory):
+    # Threads writing to the shared in-memory SQLite database fail instead of waiting for the lock
+    database = settings.DATABASES['default']
+    if database['ENGINE'] == 'django.db.backends.sqlite3':
+        database.setdefault('TEST', {})['NAME'] = str(tmp_path_factory.mktemp('db') / 'test.sqlite3')
+        database.setdefault('OPTIONS', {}).setdefault('timeout', 30)
+        # A second file stands in for a read replica that has not caught up with the primary
+        settings.DATABASES['replica'] = {
+            **database, 'TEST': {**database['TEST'], 'NAME': str(tmp_path_factory.mktemp('db') / 'replica.sqlite3')},
+        }
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    cache.clear()
+    yield
+    cache.clear()
+
+
+@pytest.fixture
+def admin_api_client():
+    admin = User.objects.create_user(username='admin', password='adminpassword', is_staff=True)
+    client = APIClient()
+    client.force_authenticate(user=admin)
+    return client
+
+
+@pytest.fixture
+def make_team():
+    group, _ = Group.objects.get_or_create(name='user')
+
+    def make(username):
+        team = User.objects.create_user(username=username, password='teampassword')
+        team.groups.add(group)
+        return team
+
+    return make
+
+
+@pytest.fixture
+def team_client():
+    def make(team):
+        client = APIClient()
+        client.force_authenticate(user=team)
+        return client
+
+    return make
+
+
+@pytest.fixture
+def make_cross():
+    def make(tasks_count, started=True, **fields):
+        db_cross = Cross.objects.create(**fields)
+        for i in range(tasks_count):
+            Task.objects.create(cross=db_cross, name=f'task{i}', coordinates=f'{i}, {i}',
+                                description=f'description{i}', correct_answer=f'answer{i}',
+                                hint1=f'hint{i}-1', hint2=f'hint{i}-2', hint3=f'hint{i}-3')
+        if started:
+            start_time = datetime.datetime.now(tz=pytz.utc)
+            db_cross.start_time = start_time
+            db_cross.end_time = start_time + db_cross.duration
+            db_cross.status = StatusChoice.STARTED
+            db_cross.save()
+        return db_cross
+
+    return make
@@ -0,0 +1,63 @@
+import asyncio
+
+import pytest
+from django.test import AsyncClient
+from django.urls import reverse
+from rest_framework import status
+
+from tournament.leaderboard import build_history_results, build_results
+
+
+def call_sync(client, name, *args, query=''):
+    response = client.post(reverse(name, args=args) + query)
+    return response.status_code, response.json()
+
+
+def call_async(client, name, *args, query=''):
+    response = asyncio.run(client.post(reverse(name, args=args) + query))
+    return response.status_code, response.json()
+
+
+def without_submission_details(data):
+    return {key: value for key, value in data.items() if key not in ('id', 'team', 'submitted_at')}
+
+
+@pytest.mark.django_db(transaction=True)
+def test_async_views_match_sync_views(make_team, team_client, make_cross):
+    db_cross = make_cross(1)
+    db_task = db_cross.tasks.first()
+    sync_client = team_client(make_team('sync'))
+    async_client = AsyncClient()
+    async_client.force_login(make_team('async'))
+
+    scenarios = [
+        ('hints', (db_task.id, 1), ''),
+        ('hints', (db_task.id, 5), ''),
+        ('hints', (db_task.id, 0), ''),
+        ('hints', (db_task.id, 1), ''),
+        ('hints', (0, 0), ''),
+        ('submit', (db_task.id,), ''),
+        ('submit', (db_task.id,), '?answer=%20'),
+        ('submit', (db_task.id,), '?answer=wrong'),
+        ('submit', (db_task.id,), '?answer=wrong'),
+        ('submit', (db_task.id,), f'?answer={db_task.correct_answer}'),
+        ('submit', (0,), '?answer=wrong'),
+    ]
+    for action, args, query in scenarios:
+        sync_status, sync_data = call_sync(sync_client, f'task-{action}', *args, query=query)
+        async_status, async_data = call_async(async_client, f'async-task-{action}', *args, query=query)
+        assert async_status == sync_status
+        if action == 'submit' and sync_status == status.HTTP_200_OK:
+            sync_data, async_data = without_submission_details(sync_data), without_submission_details(async_data)
+        assert async_data == sync_data
+
+    assert build_results(db_cross) == build_history_results(db_cross)
+
+
+@pytest.mark.django_db(transaction=True)
+def test_async_views_require_authentication(make_cross):
+    db_task = make_cross(1).tasks.first()
+
+    response = asyncio.run(AsyncClient().post(reverse('async-task-submit', args=[db_task.id]) + '?answer=a'))
+
+    assert response.status_code == status.HTTP_403_FORBIDDEN
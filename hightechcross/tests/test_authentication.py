@@ -0,0 +1,113 @@
+import pytest
+from django.contrib.auth.models import Group
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.authentication import TokenAuthentication
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APIClient
+
+from shared.authentication import LRUCache, invalidate_user_tokens
+
+
+@pytest.fixture
+def token_client():
+    def make(team):
+        client = APIClient()
+        client.credentials(HTTP_AUTHORIZATION=f'Token {Token.objects.get_or_create(user=team)[0].key}')
+        return client
+
+    return make
+
+
+def token_queries(client):
+    with CaptureQueriesContext(connection) as context:
+        response = client.get(reverse('task-list'))
+    assert response.status_code == status.HTTP_200_OK
+    return [query['sql'] for query in context.captured_queries if 'authtoken_token' in query['sql']]
+
+
+@pytest.mark.django_db
+def test_token_lookup_is_cached(make_team, token_client, make_cross):
+    make_cross(1)
+    client = token_client(make_team('team'))
+
+    # The user id of the token, then the token with its user
+    assert len(token_queries(client)) == 2
+    assert token_queries(client) == []
+
+
+@pytest.mark.django_db
+def test_token_invalidated_while_loading_is_not_cached(make_team, token_client, make_cross, monkeypatch):
+    make_cross(1)
+    team = make_team('team')
+    client = token_client(team)
+    load = TokenAuthentication.authenticate_credentials
+
+    def load_then_invalidate(self, key):
+        result = load(self, key)
+        invalidate_user_tokens(team.id)
+        return result
+
+    monkeypatch.setattr(TokenAuthentication, 'authenticate_credentials', load_then_invalidate)
+    token_queries(client)
+    monkeypatch.undo()
+
+    assert token_queries(client) != []
+
+
+@pytest.mark.django_db
+def test_cached_token_is_dropped_on_logout(make_team, token_client, make_cross):
+    make_cross(1)
+    client = token_client(make_team('team'))
+    client.get(reverse('task-list'))
+
+    assert client.post('/api/auth/logout/').status_code == status.HTTP_200_OK
+
+    assert client.get(reverse('task-list')).status_code == status.HTTP_403_FORBIDDEN
+
+
+@pytest.mark.django_db
+def test_cached_token_is_dropped_on_rotation_and_user_deletion(make_team, token_client, make_cross):
+    make_cross(1)
+    team = make_team('team')
+    client = token_client(team)
+    client.get(reverse('task-list'))
+
+    Token.objects.filter(user=team).delete()
+    assert client.get(reverse('task-list')).status_code == status.HTTP_403_FORBIDDEN
+
+    client = token_client(team)
+    client.get(reverse('task-list'))
+    team.delete()
+    assert client.get(reverse('task-list')).status_code == status.HTTP_403_FORBIDDEN
+
+
+@pytest.mark.django_db
+def test_cached_user_follows_group_and_staff_changes(make_team, token_client, make_cross):
+    db_cross = make_cross(1)
+    team = make_team('team')
+    client = token_client(team)
+    url = reverse('cross-results', args=[db_cross.id])
+    assert client.get(url).status_code == status.HTTP_403_FORBIDDEN
+
+    team.is_staff = True
+    team.save()
+    assert client.get(url).status_code == status.HTTP_200_OK
+
+    Group.objects.get(name='user').user_set.clear()
+    assert token_queries(client) != []
+
+
+def test_lru_cache_evicts_oldest_and_expired_entries():
+    now = [0]
+    lru = LRUCache(max_size=2, ttl=10, clock=lambda: now[0])
+    lru.set('a', 1)
+    lru.set('b', 2)
+    lru.get('a')
+    lru.set('c', 3)
+    assert (lru.get('a'), lru.get('b'), lru.get('c')) == (1, None, 3)
+
+    now[0] = 10
+    assert lru.get('a') is None
@@ -0,0 +1,170 @@
+import datetime
+import json
+
+import pytest
+from django.db import IntegrityError
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.renderers import JSONRenderer
+
+from tournament.models import Answer, AnswerKey, Cross, StatusChoice
+from tournament.projections import CROSS_COLUMNS
+from tournament.serializers import AnswerSerializer, CrossSerializer
+
+
+@pytest.mark.django_db
+def test_start_cross(admin_api_client, make_cross):
+    db_cross = make_cross(1, started=False)
+
+    response = admin_api_client.post(reverse('cross-start', args=[db_cross.id]))
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response.data['status'] == StatusChoice.STARTED
+    db_cross.refresh_from_db()
+    assert db_cross.end_time > db_cross.start_time
+
+
+@pytest.mark.django_db
+def test_start_cross_uses_its_duration(admin_api_client, make_cross):
+    db_cross = make_cross(1, started=False, duration=datetime.timedelta(hours=2))
+
+    response = admin_api_client.post(reverse('cross-start', args=[db_cross.id]))
+
+    assert response.status_code == status.HTTP_200_OK
+    db_cross.refresh_from_db()
+    assert db_cross.end_time - db_cross.start_time == datetime.timedelta(hours=2)
+
+
+@pytest.mark.django_db
+def test_only_one_cross_can_be_started(admin_api_client, make_cross):
+    make_cross(1)
+    db_cross = make_cross(1, started=False)
+
+    response = admin_api_client.post(reverse('cross-start', args=[db_cross.id]))
+
+    assert response.status_code == status.HTTP_405_METHOD_NOT_ALLOWED
+    with pytest.raises(IntegrityError):
+        Cross.objects.filter(pk=db_cross.id).update(status=StatusChoice.STARTED)
+
+
+def cross_data(name, tasks_count):
+    return {'tasks': [{'name': f'{name}-task{i}', 'coordinates': f'{i}, {i}', 'description': 'description',
+                       'correct_answer': 'answer', 'hint1': 'hint1', 'hint2': 'hint2', 'hint3': 'hint3'}
+                      for i in range(tasks_count)]}
+
+
+@pytest.mark.django_db
+def test_create_cross(admin_api_client):
+    response = admin_api_client.post(reverse('cross-list'), cross_data('cross', 3), format='json')
+
+    assert response.status_code == status.HTTP_201_CREATED
+    assert [task['name'] for task in response.data['tasks']] == ['cross-task0', 'cross-task1', 'cross-task2']
+    assert Cross.objects.get().tasks.count() == 3
+
+
+@pytest.mark.django_db
+def test_import_crosses(admin_api_client):
+    response = admin_api_client.post(reverse('cross-import-crosses'),
+                                     [cross_data('first', 2), cross_data('second', 3)], format='json')
+
+    assert response.status_code == status.HTTP_201_CREATED
+    assert response.data['tasks'] == 5
+    first, second = [Cross.objects.get(pk=pk) for pk in response.data['crosses']]
+    assert list(first.tasks.values_list('name', flat=True)) == ['first-task0', 'first-task1']
+    assert second.tasks.count() == 3
+    assert AnswerKey.objects.filter(task__cross=second).count() == 3
+
+
+@pytest.mark.django_db
+def test_import_crosses_ndjson(admin_api_client):
+    body = '\n'.join(json.dumps(cross_data(f'cross{i}', 2)) for i in range(3)) + '\n'
+
+    response = admin_api_client.post(reverse('cross-import-crosses'), body,
+                                     content_type='application/x-ndjson')
+
+    assert response.status_code == status.HTTP_201_CREATED
+    assert len(response.data['crosses']) == 3
+    assert Cross.objects.count() == 3
+
+
+@pytest.mark.django_db
+def test_import_crosses_validates_everything_first(admin_api_client):
+    invalid = cross_data('invalid', 1)
+    del invalid['tasks'][0]['correct_answer']
+
+    response = admin_api_client.post(reverse('cross-import-crosses'),
+                                     [cross_data('valid', 2), invalid], format='json')
+
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+    assert 'correct_answer' in response.data[1]['tasks'][0]
+    assert not Cross.objects.exists()
+
+
+@pytest.mark.django_db
+def test_list_crosses_returns_headers(admin_api_client, django_assert_num_queries, make_cross):
+    for _ in range(3):
+        make_cross(2, started=False)
+
+    with django_assert_num_queries(1):
+        response = admin_api_client.get(reverse('cross-list'))
+
+    assert response.status_code == status.HTTP_200_OK
+    assert len(response.data['results']) == 3
+    assert set(response.data['results'][0]) == {'id', 'start_time', 'end_time', 'status'}
+
+
+@pytest.mark.django_db
+def test_list_crosses_expand_tasks(admin_api_client, django_assert_num_queries, make_cross):
+    for _ in range(3):
+        make_cross(2, started=False)
+
+    with django_assert_num_queries(2):
+        response = admin_api_client.get(reverse('cross-list') + '?fields=id&expand=tasks')
+
+    assert set(response.data['results'][0]) == {'id', 'tasks'}
+    assert len(response.data['results'][0]['tasks']) == 2
+
+
+@pytest.mark.django_db
+def test_retrieve_unknown_cross(admin_api_client, make_cross):
+    db_cross = make_cross(0, started=False)
+
+    for pk in (db_cross.id + 1, 'abc'):
+        response = admin_api_client.get(reverse('cross-detail', args=[pk]))
+        assert response.status_code == status.HTTP_404_NOT_FOUND
+
+
+@pytest.mark.django_db
+def test_list_crosses_rejects_unknown_fields(admin_api_client):
+    response = admin_api_client.get(reverse('cross-list') + '?fields=id,name,secret')
+
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+    assert response.data == {'fields': ['Unknown fields: name, secret']}
+
+
+@pytest.mark.django_db
+def test_list_crosses_cursor_pagination(admin_api_client, make_cross):
+    ids = sorted((make_cross(0, started=False).id for _ in range(5)), reverse=True)
+
+    first_page = admin_api_client.get(reverse('cross-list') + '?page_size=2')
+    second_page = admin_api_client.get(first_page.data['next'])
+
+    assert [cross['id'] for cross in first_page.data['results']] == ids[:2]
+    assert [cross['id'] for cross in second_page.data['results']] == ids[2:4]
+
+
+@pytest.mark.django_db
+def test_projections_render_like_serializers(admin_api_client, make_team, team_client, make_cross):
+    db_cross = make_cross(3)
+    db_task = db_cross.tasks.first()
+
+    response = admin_api_client.get(reverse('cross-detail', args=[db_cross.id]))
+    assert response.content == JSONRenderer().render(CrossSerializer(db_cross).data)
+
+    response = admin_api_client.get(reverse('cross-list') + f"?fields={','.join(CROSS_COLUMNS)}&expand=tasks")
+    assert json.loads(response.content)['results'] == json.loads(
+        JSONRenderer().render(CrossSerializer([db_cross], many=True).data))
+
+    response = team_client(make_team('team')).post(reverse('task-submit', args=[db_task.id]) + '?answer=a')
+    db_answer = Answer.objects.get()
+    assert response.content == JSONRenderer().render(AnswerSerializer(db_answer).data)
@@ -0,0 +1,16 @@
+import pytest
+from django.db import connection
+from django.test import override_settings
+
+
+@pytest.mark.skipif(connection.vendor != 'sqlite', reason='SQLite pragmas')
+@pytest.mark.django_db(transaction=True)
+def test_sqlite_pragmas_are_applied_to_new_connections():
+    pragmas = {'journal_mode': 'WAL', 'synchronous': 'NORMAL', 'mmap_size': 1024 * 1024}
+    with override_settings(SQLITE_PRAGMAS=pragmas):
+        connection.close()
+        with connection.cursor() as cursor:
+            values = [cursor.execute(f'PRAGMA {name}').fetchone()[0] for name in pragmas]
+    connection.close()
+
+    assert values == ['wal', 1, 1024 * 1024]
@@ -0,0 +1,54 @@
+import csv
+import io
+import json
+
+import pytest
+from django.core.management import call_command
+from django.urls import reverse
+from rest_framework import status
+
+
+@pytest.fixture
+def played_cross(make_team, team_client, make_cross):
+    db_cross = make_cross(2)
+    first_task, second_task = db_cross.tasks.all()
+    first = team_client(make_team('first'))
+    first.post(reverse('task-submit', args=[first_task.id]) + '?answer=wrong')
+    first.post(reverse('task-submit', args=[first_task.id]) + f'?answer={first_task.correct_answer}')
+    first.post(reverse('task-submit', args=[second_task.id]) + f'?answer={second_task.correct_answer}')
+    make_team('second')
+    return db_cross
+
+
+def export(client, db_cross, kind, export_format):
+    response = client.get(reverse('cross-export', args=[db_cross.id, kind, export_format]))
+    assert response.status_code == status.HTTP_200_OK
+    assert response.streaming
+    return b''.join(response.streaming_content).decode()
+
+
+@pytest.mark.django_db
+def test_export_answers_csv(admin_api_client, played_cross):
+    rows = list(csv.DictReader(io.StringIO(export(admin_api_client, played_cross, 'answers', 'csv'))))
+
+    assert [(row['team'], row['answer'], row['is_correct']) for row in rows] == [
+        ('first', 'wrong', 'False'), ('first', 'answer0', 'True'), ('first', 'answer1', 'True')]
+
+
+@pytest.mark.django_db
+def test_export_standings_ndjson(admin_api_client, played_cross):
+    lines = export(admin_api_client, played_cross, 'standings', 'ndjson').splitlines()
+
+    standings = [json.loads(line) for line in lines]
+    assert [(row['place'], row['team'], row['completed_tasks']) for row in standings] == [
+        (1, 'first', 2), (2, 'second', 0)]
+
+
+@pytest.mark.django_db
+def test_export_cross_command(tmp_path, played_cross):
+    output = tmp_path / 'answers.ndjson'
+
+    call_command('export_cross', played_cross.id, '--format', 'ndjson', '--output', str(output), '--chunk-size', 1)
+
+    answers = [json.loads(line) for line in output.read_text().splitlines()]
+    assert [answer['answer'] for answer in answers] == ['wrong', 'answer0', 'answer1']
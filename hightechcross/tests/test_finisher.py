@@ -0,0 +1,64 @@
+import datetime
+
+import pytest
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+
+from tournament.finisher import Finisher
+from tournament.leaderboard import build_results
+from tournament.models import Cross, FinalResults, StatusChoice
+
+
+class FakeClock:
+    def __init__(self, now):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.mark.django_db
+def test_finisher_finishes_cross_at_end_time(admin_api_client, make_team, team_client, make_cross):
+    db_cross = make_cross(2)
+    db_task = db_cross.tasks.first()
+    client = team_client(make_team('team'))
+    client.post(reverse('task-submit', args=[db_task.id]) + f'?answer={db_task.correct_answer}')
+    clock = FakeClock(db_cross.end_time - datetime.timedelta(minutes=5))
+    sleeps = []
+    finisher = Finisher(clock=clock, sleep=sleeps.append, poll_interval=600)
+
+    finisher.run(iterations=2)
+    assert sleeps == [300]
+    assert Cross.objects.get().status == StatusChoice.STARTED
+
+    clock.now = db_cross.end_time
+    assert finisher.run_once() == [db_cross]
+    assert Cross.objects.get().status == StatusChoice.FINISHED
+    assert finisher.get_delay() == finisher.poll_interval
+    expected = build_results(db_cross)
+
+    response = client.post(reverse('task-submit', args=[db_task.id]) + '?answer=late')
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+    assert response.data['detail'] == 'Cross finished'
+
+    with CaptureQueriesContext(connection) as context:
+        response = admin_api_client.get(reverse('cross-results', args=[db_cross.id]))
+    assert response.status_code == status.HTTP_200_OK
+    assert response.data == expected
+    assert not any('tournament_standing' in query['sql'] for query in context.captured_queries)
+
+
+@pytest.mark.django_db
+def test_finish_crosses_command(make_cross):
+    db_cross = make_cross(1)
+    db_cross.end_time = db_cross.start_time
+    db_cross.save()
+    make_cross(1, started=False)
+
+    call_command('finish_crosses', '--once')
+
+    assert list(Cross.objects.filter(status=StatusChoice.FINISHED)) == [db_cross]
+    assert FinalResults.objects.get().cross == db_cross
@@ -0,0 +1,220 @@
+import datetime
+
+import pytest
+from django.contrib.auth.models import Group, User
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+
+from tournament.leaderboard import build_history_results, build_results
+from tournament.models import Answer, HintTaken, Standing, StatusChoice
+
+
+def play_task(client, db_task):
+    client.post(reverse('task-submit', args=[db_task.id]) + '?answer=wrong')
+    client.post(reverse('task-hints', args=[db_task.id, 0]))
+    client.post(reverse('task-hints', args=[db_task.id, 1]))
+    return client.post(reverse('task-submit', args=[db_task.id]) + f'?answer={db_task.correct_answer}')
+
+
+def fill_cross(db_cross, make_team, team_client, teams_count, prefix='team'):
+    db_tasks = list(db_cross.tasks.all())
+    for i in range(teams_count):
+        client = team_client(make_team(f'{prefix}{i}'))
+        for db_task in db_tasks:
+            play_task(client, db_task)
+
+
+def count_results_queries(client, db_cross):
+    with CaptureQueriesContext(connection) as context:
+        response = client.get(reverse('cross-results', args=[db_cross.id]))
+    assert response.status_code == status.HTTP_200_OK
+    return len(context.captured_queries)
+
+
+@pytest.mark.django_db
+def test_results_penalty(admin_api_client, make_team, team_client, make_cross):
+    db_cross = make_cross(2)
+    db_task = db_cross.tasks.first()
+    team = make_team('team')
+    play_task(team_client(team), db_task)
+    db_answer = Answer.objects.get(team=team, task=db_task, is_correct=True)
+
+    response = admin_api_client.get(reverse('cross-results', args=[db_cross.id]))
+
+    assert response.status_code == status.HTTP_200_OK
+    assert len(response.data) == 1
+    assert response.data[0]['team'] == 'team'
+    assert response.data[0]['completed_tasks'] == 1
+    assert [task['status'] for task in response.data[0]['tasks']] == [True, False]
+    expected_penalty = (db_answer.submitted_at - db_cross.start_time
+                        + datetime.timedelta(minutes=15) * 2 + datetime.timedelta(minutes=30))
+    assert response.data[0]['penalty_time'] == expected_penalty
+    assert build_results(db_cross) == build_history_results(db_cross)
+
+
+@pytest.mark.django_db
+def test_results_ranking(admin_api_client, make_team, team_client, make_cross):
+    db_cross = make_cross(2)
+    db_first_task, db_second_task = db_cross.tasks.order_by('id')
+    make_team('idle_b')
+    make_team('idle_a')
+    play_task(team_client(make_team('slow')), db_first_task)
+    fast_client = team_client(make_team('fast'))
+    fast_client.post(reverse('task-submit', args=[db_first_task.id]) + f'?answer={db_first_task.correct_answer}')
+    leader_client = team_client(make_team('leader'))
+    for db_task in (db_first_task, db_second_task):
+        play_task(leader_client, db_task)
+
+    response = admin_api_client.get(reverse('cross-results', args=[db_cross.id]))
+
+    assert response.status_code == status.HTTP_200_OK
+    assert [(result['place'], result['team']) for result in response.data] == [
+        (1, 'leader'), (2, 'fast'), (3, 'slow'), (4, 'idle_a'), (4, 'idle_b'),
+    ]
+    assert build_results(db_cross) == build_history_results(db_cross)
+
+
+@pytest.mark.django_db
+def test_cross_keeps_compiled_rules(make_cross, monkeypatch):
+    db_cross = make_cross(1)
+    rules = db_cross.rules
+    monkeypatch.setattr('tournament.rules.compile_rules', None)
+    assert db_cross.rules is rules
+    monkeypatch.undo()
+
+    db_cross.hint_penalty = datetime.timedelta(minutes=1)
+    db_cross.save()
+    assert db_cross.rules.hint_penalty == datetime.timedelta(minutes=1)
+
+
+@pytest.mark.django_db
+def test_rescore_finished_cross(admin_api_client, make_team, team_client, make_cross):
+    db_cross = make_cross(1)
+    db_task = db_cross.tasks.first()
+    play_task(team_client(make_team('team')), db_task)
+    penalty = build_results(db_cross)[0]['penalty_time']
+    url = reverse('cross-rescore', args=[db_cross.id])
+    assert admin_api_client.post(url, {'hint_penalty': '00:01:00'}, format='json').status_code == status.HTTP_405_METHOD_NOT_ALLOWED
+
+    db_cross.status = StatusChoice.FINISHED
+    db_cross.save()
+    response = admin_api_client.post(url, {'hint_penalty': '00:01:00', 'wrong_answer_penalty': '00:00:00'},
+                                     format='json')
+
+    assert response.status_code == status.HTTP_200_OK
+    db_cross.refresh_from_db()
+    assert response.data['hint_penalty'] == '00:01:00'
+    expected_penalty = (penalty - datetime.timedelta(minutes=15) * 2 - datetime.timedelta(minutes=30)
+                        + datetime.timedelta(minutes=1) * 2)
+    assert build_results(db_cross)[0]['penalty_time'] == expected_penalty
+    assert build_results(db_cross) == build_history_results(db_cross)
+
+
+@pytest.mark.django_db
+def test_results_query_count_does_not_grow(admin_api_client, make_team, team_client, make_cross):
+    small_cross = make_cross(1)
+    fill_cross(small_cross, make_team, team_client, 1, prefix='small')
+    small_count = count_results_queries(admin_api_client, small_cross)
+    small_cross.status = StatusChoice.FINISHED
+    small_cross.save()
+
+    big_cross = make_cross(5)
+    fill_cross(big_cross, make_team, team_client, 10, prefix='big')
+    big_count = count_results_queries(admin_api_client, big_cross)
+
+    assert big_count == small_count
+
+
+@pytest.mark.django_db
+def test_results_read_teams_from_roster(make_team, team_client, make_cross):
+    db_cross = make_cross(1)
+    make_team('second')
+    make_team('first')
+    build_results(db_cross)
+
+    with CaptureQueriesContext(connection) as context:
+        results = build_results(db_cross)
+    assert [result['team'] for result in results] == ['first', 'second']
+    assert not any('auth_user_groups' in query['sql'] for query in context.captured_queries)
+
+    make_team('third')
+    assert [result['team'] for result in build_results(db_cross)] == ['first', 'second', 'third']
+    Group.objects.get(name='user').user_set.remove(User.objects.get(username='second'))
+    assert [result['team'] for result in build_results(db_cross)] == ['first', 'third']
+
+
+@pytest.mark.django_db
+def test_rebuild_standings_from_history(make_team, make_cross):
+    db_cross = make_cross(2)
+    db_task = db_cross.tasks.first()
+    team = make_team('team')
+    Answer.objects.create(team=team, task=db_task, answer='wrong', is_correct=False)
+    Answer.objects.create(team=team, task=db_task, answer=db_task.correct_answer, is_correct=True)
+    HintTaken.objects.create(team=team, task=db_task, hint_number=3)
+    assert build_results(db_cross)[0]['completed_tasks'] == 0
+
+    call_command('rebuild_standings', db_cross.id)
+
+    assert build_results(db_cross)[0]['completed_tasks'] == 1
+    assert build_results(db_cross) == build_history_results(db_cross)
+    assert Standing.objects.get(team=team, task=db_task).solved_answer_text == db_task.correct_answer
+    call_command('rebuild_standings', '--check')
+
+
+@pytest.mark.django_db(transaction=True)
+def test_results_conditional_get(admin_api_client, make_team, team_client, make_cross):
+    db_cross = make_cross(2)
+    db_task = db_cross.tasks.first()
+    client = team_client(make_team('team'))
+    url = reverse('cross-results', args=[db_cross.id])
+
+    response = admin_api_client.get(url)
+    assert response.status_code == status.HTTP_200_OK
+    etag = response.headers['ETag']
+    assert response.headers['Last-Modified']
+
+    with CaptureQueriesContext(connection) as context:
+        response = admin_api_client.get(url, HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == status.HTTP_304_NOT_MODIFIED
+    assert not any('tournament_standing' in query['sql'] for query in context.captured_queries)
+
+    client.post(reverse('task-submit', args=[db_task.id]) + f'?answer={db_task.correct_answer}')
+
+    response = admin_api_client.get(url, HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == status.HTTP_200_OK
+    assert response.headers['ETag'] != etag
+    assert response.data[0]['completed_tasks'] == 1
+
+    with CaptureQueriesContext(connection) as context:
+        response = admin_api_client.get(url)
+    assert response.status_code == status.HTTP_200_OK
+    assert response.data[0]['completed_tasks'] == 1
+    assert not any('tournament_standing' in query['sql'] for query in context.captured_queries)
+
+
+@pytest.mark.django_db(transaction=True)
+def test_results_change_with_the_teams(admin_api_client, make_team, make_cross):
+    db_cross = make_cross(1)
+    make_team('first')
+    url = reverse('cross-results', args=[db_cross.id])
+
+    response = admin_api_client.get(url)
+    assert [result['team'] for result in response.data] == ['first']
+    etag = response.headers['ETag']
+
+    make_team('second')
+
+    response = admin_api_client.get(url, HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == status.HTTP_200_OK
+    assert [result['team'] for result in response.data] == ['first', 'second']
+
+    team = User.objects.get(username='second')
+    team.username = 'renamed'
+    team.save()
+
+    response = admin_api_client.get(url, HTTP_IF_NONE_MATCH=response.headers['ETag'])
+    assert response.status_code == status.HTTP_200_OK
+    assert [result['team'] for result in response.data] == ['first', 'renamed']
@@ -0,0 +1,78 @@
+import asyncio
+
+import pytest
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.contrib.sessions.models import Session
+from django.db import connection
+from django.test import AsyncClient, override_settings
+from django.urls import reverse
+from rest_framework import status
+
+from shared.routers import STICKY_COOKIE
+from tournament.models import Answer, Cross, Task
+
+pytestmark = pytest.mark.skipif(connection.vendor != 'sqlite', reason='replica stand-in is a SQLite file')
+
+REPLICA_SETTINGS = {
+    'DATABASE_ROUTERS': ['shared.routers.ReplicaRouter'],
+    'MIDDLEWARE': ['shared.routers.ReplicaRoutingMiddleware', *settings.MIDDLEWARE],
+}
+
+
+def replicate(model, *objects):
+    model.objects.using('replica').bulk_create(objects)
+
+
+@pytest.mark.django_db(databases=['default', 'replica'], transaction=True)
+def test_reads_go_to_replica_until_the_client_writes(make_team, team_client, make_cross):
+    db_cross = make_cross(1)
+    db_task = db_cross.tasks.first()
+    team = make_team('team')
+    client = team_client(team)
+    replicate(Cross, db_cross)
+    replicate(Task, db_task)
+    replicate(User, team)
+
+    with override_settings(**REPLICA_SETTINGS):
+        response = client.post(reverse('task-submit', args=[db_task.id]) + '?answer=wrong')
+        assert response.status_code == status.HTTP_200_OK
+        assert Answer.objects.filter(pk=response.data['id']).exists()
+        assert STICKY_COOKIE in response.cookies
+
+        # The client has just written, it reads from the primary
+        response = client.get(reverse('task-list'))
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data[0]['status'] == 'wrong'
+
+        # Without the cookie the read goes to the replica, which has not received the answer yet
+        client.cookies.clear()
+        response = client.get(reverse('task-list'))
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data[0]['status'] == 'not started'
+
+
+@pytest.mark.django_db(databases=['default', 'replica'], transaction=True)
+def test_async_reads_go_to_replica_until_the_client_writes(make_team, make_cross):
+    db_task = make_cross(1).tasks.first()
+    team = make_team('team')
+    client = AsyncClient()
+    client.force_login(team)
+    replicate(User, team)
+    replicate(Session, *Session.objects.all())
+
+    async def scenario():
+        # The replica has not received the started cross yet
+        response = await client.get(reverse('task-stream'))
+        assert response.status_code == status.HTTP_405_METHOD_NOT_ALLOWED
+
+        response = await client.post(reverse('async-task-submit', args=[db_task.id]) + '?answer=wrong')
+        assert response.status_code == status.HTTP_200_OK
+        assert STICKY_COOKIE in response.cookies
+
+        response = await client.get(reverse('task-stream'))
+        assert response.status_code == status.HTTP_200_OK
+        await response.streaming_content.aclose()
+
+    with override_settings(**REPLICA_SETTINGS):
+        asyncio.run(scenario())
@@ -0,0 +1,107 @@
+import asyncio
+import threading
+
+import pytest
+from asgiref.sync import sync_to_async
+from django.db import connection
+from django.test import AsyncClient
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+
+from tournament.broker import InProcessBroker
+from tournament.streams import event_stream
+
+
+def test_in_process_broker_delivers_across_threads():
+    broker = InProcessBroker()
+
+    async def scenario():
+        subscription = await broker.subscribe('channel')
+        assert await subscription.get(timeout=0.01) is None
+
+        thread = threading.Thread(target=broker.publish, args=('channel', {'event': 'e', 'data': 1}))
+        thread.start()
+        thread.join()
+        broker.publish('other', {'event': 'e', 'data': 2})
+
+        assert await subscription.get(timeout=1) == {'event': 'e', 'data': 1}
+        assert await subscription.get(timeout=0.01) is None
+        await subscription.close()
+
+    asyncio.run(scenario())
+    assert broker.subscriptions == {}
+
+
+def test_event_stream_keepalive_and_max_age(settings):
+    settings.TOURNAMENT_BROKER = 'tournament.broker.InProcessBroker'
+
+    async def scenario():
+        return [chunk async for chunk in event_stream('channel', keepalive=0.01, max_age=0.05)]
+
+    chunks = asyncio.run(scenario())
+    assert chunks[0].startswith('retry:')
+    assert chunks[1:] and all(chunk == ': keepalive\n\n' for chunk in chunks[1:])
+
+
+@pytest.mark.django_db(transaction=True)
+def test_task_and_cross_streams(admin_user, make_team, team_client, make_cross):
+    db_cross = make_cross(1)
+    db_task = db_cross.tasks.first()
+    team = make_team('team')
+    submit = sync_to_async(team_client(team).post)
+
+    team_stream_client = AsyncClient()
+    team_stream_client.force_login(team)
+    admin_stream_client = AsyncClient()
+    admin_stream_client.force_login(admin_user)
+
+    async def scenario():
+        team_response = await team_stream_client.get(reverse('task-stream'))
+        assert team_response.status_code == status.HTTP_200_OK
+        assert team_response.headers['Content-Type'] == 'text/event-stream'
+        team_events = aiter(team_response.streaming_content)
+        assert (await anext(team_events)).startswith(b'retry:')
+
+        admin_response = await admin_stream_client.get(reverse('cross-stream', args=[db_cross.id]))
+        assert admin_response.status_code == status.HTTP_200_OK
+        admin_events = aiter(admin_response.streaming_content)
+        assert (await anext(admin_events)).startswith(b'retry:')
+
+        await submit(reverse('task-submit', args=[db_task.id]) + f'?answer={db_task.correct_answer}')
+
+        team_event = await asyncio.wait_for(anext(team_events), 5)
+        admin_event = await asyncio.wait_for(anext(admin_events), 5)
+        await team_response.streaming_content.aclose()
+        await admin_response.streaming_content.aclose()
+        return team_event, admin_event
+
+    team_event, admin_event = asyncio.run(scenario())
+    assert team_event.startswith(b'event: task\n')
+    assert b'"status": "correct"' in team_event
+    assert admin_event.startswith(b'event: standing\n')
+    assert b'"completed_tasks": 1' in admin_event
+
+
+@pytest.mark.django_db(transaction=True)
+def test_cross_stream_requires_admin(make_team, make_cross):
+    db_cross = make_cross(1)
+    client = AsyncClient()
+    client.force_login(make_team('team'))
+
+    response = asyncio.run(client.get(reverse('cross-stream', args=[db_cross.id])))
+
+    assert response.status_code == status.HTTP_403_FORBIDDEN
+
+
+@pytest.mark.django_db(transaction=True)
+def test_submit_without_subscribers_skips_team_totals(settings, make_team, team_client, make_cross):
+    settings.TOURNAMENT_BROKER = 'tournament.broker.InProcessBroker'
+    db_cross = make_cross(1)
+    db_task = db_cross.tasks.first()
+    client = team_client(make_team('team'))
+
+    with CaptureQueriesContext(connection) as context:
+        response = client.post(reverse('task-submit', args=[db_task.id]) + '?answer=wrong')
+    assert response.status_code == status.HTTP_200_OK
+    assert not any('SUM(' in query['sql'] for query in context.captured_queries)
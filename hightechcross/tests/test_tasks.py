@@ -0,0 +1,243 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from django.db import IntegrityError, connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+
+from tournament import services
+from tournament.models import Answer, HintTaken, Standing
+
+
+@pytest.mark.django_db
+def test_list_tasks(make_team, team_client, make_cross):
+    db_cross = make_cross(3)
+    first_task, second_task, _ = db_cross.tasks.all()
+    client = team_client(make_team('team'))
+    client.post(reverse('task-hints', args=[first_task.id, 0]))
+    client.post(reverse('task-hints', args=[first_task.id, 1]))
+    client.post(reverse('task-submit', args=[first_task.id]) + f'?answer={first_task.correct_answer}')
+    client.post(reverse('task-submit', args=[second_task.id]) + '?answer=wrong')
+
+    response = client.get(reverse('task-list'))
+
+    assert response.status_code == status.HTTP_200_OK
+    assert [task['status'] for task in response.data] == ['correct', 'wrong', 'not started']
+    assert response.data[0]['hints'] == [first_task.hint1, first_task.hint2]
+    assert response.data[1]['hints'] == []
+    assert response.data[0]['name'] == first_task.name
+    assert response.data[0]['coordinates'] == first_task.coordinates
+    assert response.data[0]['description'] == first_task.description
+
+
+@pytest.mark.django_db
+def test_submit_normalized_answer(make_team, team_client, make_cross):
+    db_task = make_cross(1, normalize_answers=True).tasks.first()
+    db_task.alternative_answers = ['Ａnswer  Zero']
+    db_task.save()
+    client = team_client(make_team('team'))
+    url = reverse('task-submit', args=[db_task.id])
+
+    first = client.post(url + '?answer=Wrong  one')
+    second = client.post(url + '?answer= WRONG one ')
+    assert first.data['id'] == second.data['id']
+    assert Answer.objects.count() == 1
+
+    response = client.post(url + '?answer=answer zero')
+    assert response.data['is_correct']
+    assert Standing.objects.get().wrong_answers == 1
+
+    response = client.post(url + '?answer=anything')
+    assert response.data['is_correct']
+    assert response.data['answer'] == 'answer zero'
+
+
+@pytest.mark.django_db
+def test_submit_matches_exactly_by_default(make_team, team_client, make_cross):
+    db_task = make_cross(1).tasks.first()
+    client = team_client(make_team('team'))
+
+    response = client.post(reverse('task-submit', args=[db_task.id]) + '?answer=ANSWER0')
+
+    assert not response.data['is_correct']
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize('query', ['', '?answer=', '?answer=%20%20'])
+def test_submit_requires_answer(make_team, team_client, make_cross, query):
+    db_task = make_cross(1).tasks.first()
+    client = team_client(make_team('team'))
+
+    response = client.post(reverse('task-submit', args=[db_task.id]) + query)
+
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+    assert not Answer.objects.exists()
+
+
+@pytest.mark.django_db
+def test_submit_reraises_other_integrity_errors(monkeypatch, make_team, make_cross):
+    db_task = make_cross(1).tasks.first()
+
+    def fail(*args):
+        raise IntegrityError('FOREIGN KEY constraint failed')
+
+    monkeypatch.setattr(services, 'create_answer', fail)
+    with pytest.raises(IntegrityError):
+        services.submit_answer(make_team('team'), db_task, 'wrong')
+
+
+@pytest.mark.django_db
+def test_list_tasks_ignores_other_teams(make_team, team_client, make_cross):
+    db_cross = make_cross(1)
+    db_task = db_cross.tasks.first()
+    team_client(make_team('other')).post(reverse('task-hints', args=[db_task.id, 0]))
+
+    response = team_client(make_team('team')).get(reverse('task-list'))
+
+    assert response.data[0]['hints'] == []
+    assert response.data[0]['status'] == 'not started'
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize('tasks_count', [1, 10])
+def test_list_tasks_query_count(django_assert_num_queries, make_team, team_client, make_cross, tasks_count):
+    db_cross = make_cross(tasks_count)
+    client = team_client(make_team('team'))
+    for db_task in db_cross.tasks.all():
+        client.post(reverse('task-submit', args=[db_task.id]) + '?answer=wrong')
+        client.post(reverse('task-hints', args=[db_task.id, 0]))
+
+    with django_assert_num_queries(1):
+        response = client.get(reverse('task-list'))
+
+    assert response.status_code == status.HTTP_200_OK
+    assert len(response.data) == tasks_count
+
+
+def submit_concurrently(client, db_task, answers):
+    barrier = threading.Barrier(len(answers))
+
+    def submit(answer):
+        barrier.wait()
+        try:
+            return client.post(reverse('task-submit', args=[db_task.id]) + f'?answer={answer}')
+        finally:
+            connection.close()
+
+    with ThreadPoolExecutor(max_workers=len(answers)) as executor:
+        return list(executor.map(submit, answers))
+
+
+@pytest.mark.django_db(transaction=True)
+def test_concurrent_submissions_are_not_duplicated(make_team, team_client, make_cross):
+    db_task = make_cross(1).tasks.first()
+    team = make_team('team')
+
+    responses = submit_concurrently(team_client(team), db_task, ['wrong'] * 8 + ['other'] * 8)
+
+    assert all(response.status_code == status.HTTP_200_OK for response in responses)
+    assert Answer.objects.filter(team=team, task=db_task).count() == 2
+    assert len({response.data['id'] for response in responses}) == 2
+    assert Standing.objects.get(team=team, task=db_task).wrong_answers == 2
+
+
+@pytest.mark.django_db
+def test_submissions_after_solving_are_not_stored(make_team, team_client, make_cross):
+    db_task = make_cross(1).tasks.first()
+    team = make_team('team')
+    client = team_client(team)
+    correct = client.post(reverse('task-submit', args=[db_task.id]) + f'?answer={db_task.correct_answer}')
+
+    with CaptureQueriesContext(connection) as context:
+        response = client.post(reverse('task-submit', args=[db_task.id]) + '?answer=wrong')
+
+    assert response.data == correct.data
+    # The solving answer is rebuilt from the standing, without reading the answers
+    assert not any('tournament_answer' in query['sql'] for query in context.captured_queries)
+    assert Answer.objects.filter(team=team, task=db_task).count() == 1
+
+
+@pytest.mark.django_db
+def test_submit_reads_task_from_active_cross_cache(make_team, team_client, make_cross):
+    db_task = make_cross(1).tasks.first()
+    client = team_client(make_team('team'))
+    client.get(reverse('task-list'))
+
+    with CaptureQueriesContext(connection) as context:
+        client.post(reverse('task-submit', args=[db_task.id]) + '?answer=wrong')
+        client.post(reverse('task-hints', args=[db_task.id, 0]))
+
+    assert not any('FROM "tournament_task"' in query['sql'] for query in context.captured_queries)
+    assert not any('FROM "tournament_cross"' in query['sql'] for query in context.captured_queries)
+
+
+@pytest.mark.django_db
+def test_active_cross_cache_is_invalidated(admin_api_client, make_team, team_client, make_cross):
+    db_cross = make_cross(1)
+    client = team_client(make_team('team'))
+    assert client.get(reverse('task-list')).status_code == status.HTTP_200_OK
+
+    admin_api_client.delete(reverse('cross-detail', args=[db_cross.id]))
+    assert client.get(reverse('task-list')).status_code == status.HTTP_405_METHOD_NOT_ALLOWED
+
+    db_cross = make_cross(2, started=False)
+    admin_api_client.post(reverse('cross-start', args=[db_cross.id]))
+    response = client.get(reverse('task-list'))
+    assert [task['id'] for task in response.data] == list(db_cross.tasks.values_list('id', flat=True))
+
+
+@pytest.fixture
+def wal_mode():
+    if connection.vendor == 'sqlite':
+        with connection.cursor() as cursor:
+            cursor.execute('PRAGMA journal_mode=WAL')
+
+
+def open_hints_concurrently(client, db_task, hint_numbers):
+    barrier = threading.Barrier(len(hint_numbers))
+
+    def open_hint(hint_number):
+        barrier.wait()
+        try:
+            return client.post(reverse('task-hints', args=[db_task.id, hint_number]))
+        finally:
+            connection.close()
+
+    with ThreadPoolExecutor(max_workers=len(hint_numbers)) as executor:
+        return list(executor.map(open_hint, hint_numbers))
+
+
+@pytest.mark.django_db(transaction=True)
+def test_concurrent_hints_are_not_lost(wal_mode, make_team, team_client, make_cross):
+    db_task = make_cross(1).tasks.first()
+    team = make_team('team')
+    client = team_client(team)
+
+    responses = open_hints_concurrently(client, db_task, [0] * 8)
+    assert all(response.status_code == status.HTTP_200_OK for response in responses)
+    assert HintTaken.objects.get(team=team, task=db_task).hint_number == 1
+
+    client.post(reverse('task-hints', args=[db_task.id, 1]))
+    responses = open_hints_concurrently(client, db_task, [2, 0, 1, 2] * 4)
+    assert all(response.status_code == status.HTTP_200_OK for response in responses)
+    assert HintTaken.objects.get(team=team, task=db_task).hint_number == 3
+    assert Standing.objects.get(team=team, task=db_task).hint_number == 3
+
+
+@pytest.mark.django_db
+def test_hints_must_be_opened_in_order(make_team, team_client, make_cross):
+    db_task = make_cross(1).tasks.first()
+    client = team_client(make_team('team'))
+
+    response = client.post(reverse('task-hints', args=[db_task.id, 1]))
+    assert response.status_code == status.HTTP_405_METHOD_NOT_ALLOWED
+    assert response.data['detail'] == 'Firstly you should open the 0 hint'
+
+    response = client.post(reverse('task-hints', args=[db_task.id, 0]))
+    assert response.data == {'hint': db_task.hint1}
+    response = client.post(reverse('task-hints', args=[db_task.id, 0]))
+    assert response.data == {'hint': db_task.hint1}
+    assert HintTaken.objects.get().hint_number == 1
+
@@ -0,0 +1,87 @@
+from asgiref.sync import sync_to_async
+from django.db import transaction
+from shared.routers import read_from_primary
+from shared.versions import aget_version, bump_version, get_version
+
+from .answers import load_answer_keys
+from .models import Cross, StatusChoice, Task
+
+VERSION_KEY = "tournament:active-cross:version"
+
+
+class ActiveCross:
+    """Process-local snapshot of the started cross, with its compiled scoring rules, and its tasks,
+    valid for one version."""
+
+    def __init__(self, version, cross, tasks):
+        self.version = version
+        self.cross = cross
+        self.tasks = tasks
+
+
+_snapshot = ActiveCross(None, None, {})
+
+
+def bump_active_cross_version():
+    """Invalidates the snapshots of all processes now and once more after the transaction commits.
+
+    The second bump drops snapshots other processes might have loaded before the commit.
+    """
+    bump_version(VERSION_KEY)
+    transaction.on_commit(lambda: bump_version(VERSION_KEY))
+
+
+@read_from_primary()
+def _load(version):
+    global _snapshot
+    try:
+        db_cross = Cross.objects.get(status=StatusChoice.STARTED)
+    except Cross.DoesNotExist:
+        _snapshot = ActiveCross(version, None, {})
+        return _snapshot
+
+    db_tasks = {}
+    for db_task in Task.objects.filter(cross=db_cross):
+        db_task.cross = db_cross
+        db_tasks[db_task.id] = db_task
+    load_answer_keys(list(db_tasks.values()))
+    _snapshot = ActiveCross(version, db_cross, db_tasks)
+    return _snapshot
+
+
+def get_active_cross():
+    version = get_version(VERSION_KEY)
+    snapshot = _snapshot
+    if snapshot.version == version:
+        return snapshot
+    return _load(version)
+
+
+async def aget_active_cross():
+    version = await aget_version(VERSION_KEY)
+    snapshot = _snapshot
+    if snapshot.version == version:
+        return snapshot
+    return await sync_to_async(_load)(version)
+
+
+def _task_id(pk):
+    try:
+        return int(pk)
+    except (TypeError, ValueError):
+        return None
+
+
+def get_task(pk):
+    """Returns the task with its cross, from the snapshot when it belongs to the started cross."""
+    db_task = get_active_cross().tasks.get(_task_id(pk))
+    if db_task is None:
+        db_task = Task.objects.select_related("cross").get(pk=pk)
+    return db_task
+
+
+async def aget_task(pk):
+    db_task = (await aget_active_cross()).tasks.get(_task_id(pk))
+    if db_task is None:
+        db_task = await Task.objects.select_related("cross").aget(pk=pk)
+    return db_task
@@ -0,0 +1,35 @@
+from .models import AnswerKey
+
+BATCH_SIZE = 500
+
+
+def task_answer_keys(db_task, rules):
+    """Returns the keys of the correct answer and the accepted alternatives of a task."""
+    answers = [db_task.correct_answer, *db_task.alternative_answers]
+    return {rules.answer_key(answer) for answer in answers}
+
+
+def save_answer_keys(db_tasks):
+    """Replaces the stored answer keys of the tasks, each task must have its cross loaded."""
+    AnswerKey.objects.filter(task__in=[db_task.id for db_task in db_tasks]).delete()
+    AnswerKey.objects.bulk_create([
+        AnswerKey(task=db_task, key=key)
+        for db_task in db_tasks
+        for key in task_answer_keys(db_task, db_task.cross.rules)
+    ], batch_size=BATCH_SIZE)
+
+
+def load_answer_keys(db_tasks):
+    """Sets the accepted keys on the tasks with one query, so matching their answers needs no lookups."""
+    accepted_keys = {db_task.id: set() for db_task in db_tasks}
+    for task_id, key in AnswerKey.objects.filter(task__in=list(accepted_keys)).values_list('task_id', 'key'):
+        accepted_keys[task_id].add(key)
+    for db_task in db_tasks:
+        db_task.accepted_keys = frozenset(accepted_keys[db_task.id])
+
+
+def is_accepted(db_task, answer_key):
+    accepted_keys = getattr(db_task, 'accepted_keys', None)
+    if accepted_keys is None:
+        return AnswerKey.objects.filter(task=db_task, key=answer_key).exists()
+    return answer_key in accepted_keys
@@ -1,5 +1,12 @@
 from django.apps import AppConfig
+from django.db.backends.signals import connection_created
 
 
 class TournamentConfig(AppConfig):
     name = 'tournament'
+
+    def ready(self):
+        from . import signals  # noqa: F401
+        from shared.db import apply_sqlite_pragmas
+
+        connection_created.connect(apply_sqlite_pragmas)
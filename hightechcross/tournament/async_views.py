@@ -0,0 +1,59 @@
+from asgiref.sync import sync_to_async
+from django.http import JsonResponse
+from rest_framework import status
+from rest_framework.utils.encoders import JSONEncoder
+
+from .active import aget_task
+from .authentication import async_api_view, error_response
+from .models import Task
+from .projections import project_answer
+from .services import HintNotAvailable, check_cross_open, open_hint, submit_answer
+
+# Django's async ORM cannot open transactions yet, so the writes that have to be atomic
+# with the standings update run as a single sync_to_async call
+asubmit_answer = sync_to_async(submit_answer)
+aopen_hint = sync_to_async(open_hint)
+
+
+@async_api_view(methods=["POST"])
+async def submit(request, user, pk):
+    """Async variant of TaskViewSet.submit."""
+    answer = request.GET.get("answer")
+    if not answer or not answer.strip():
+        return error_response("Answer is required", status.HTTP_400_BAD_REQUEST)
+
+    try:
+        db_task = await aget_task(pk)
+    except Task.DoesNotExist:
+        return error_response("Task not found", status.HTTP_404_NOT_FOUND)
+
+    error = check_cross_open(db_task.cross, for_answers=True)
+    if error:
+        return error_response(*error)
+
+    db_answer = await asubmit_answer(user, db_task, answer)
+
+    return JsonResponse(project_answer(db_answer), status=status.HTTP_200_OK, encoder=JSONEncoder)
+
+
+@async_api_view(methods=["POST"])
+async def hints(request, user, pk, hint_number):
+    """Async variant of TaskViewSet.hints."""
+    if hint_number not in [0, 1, 2]:
+        return error_response("Hint number should be in [0, 1, 2]", status.HTTP_400_BAD_REQUEST)
+
+    try:
+        db_task = await aget_task(pk)
+    except Task.DoesNotExist:
+        return error_response("Task not found", status.HTTP_404_NOT_FOUND)
+
+    error = check_cross_open(db_task.cross)
+    if error:
+        return error_response(*error)
+
+    try:
+        hint = await aopen_hint(user, db_task, hint_number)
+    except HintNotAvailable as e:
+        return error_response(str(e), status.HTTP_405_METHOD_NOT_ALLOWED)
+
+    return JsonResponse({"hint": hint}, status=status.HTTP_200_OK, encoder=JSONEncoder)
@@ -0,0 +1,57 @@
+import functools
+
+from asgiref.sync import sync_to_async
+from django.http import JsonResponse
+from rest_framework import exceptions
+from rest_framework.request import Request
+from rest_framework.settings import api_settings
+from rest_framework.utils.encoders import JSONEncoder
+
+
+def error_response(detail, status, headers=None):
+    return JsonResponse({"detail": detail}, status=status, headers=headers, encoder=JSONEncoder)
+
+
+@sync_to_async
+def authenticate(request):
+    """Runs the DRF authenticators for a plain async Django view.
+
+    Returns the user and the WWW-Authenticate header DRF would send for unauthenticated requests.
+    """
+    authenticators = [auth() for auth in api_settings.DEFAULT_AUTHENTICATION_CLASSES]
+    drf_request = Request(request, authenticators=authenticators)
+    authenticate_header = authenticators[0].authenticate_header(drf_request) if authenticators else None
+    return drf_request.user, authenticate_header
+
+
+def async_api_view(methods, admin=False):
+    """Gives an async Django view the method, authentication and permission checks of the DRF views.
+
+    The view is called with the authenticated user as the second argument.
+    """
+    def decorator(view):
+        @functools.wraps(view)
+        async def wrapper(request, *args, **kwargs):
+            if request.method not in methods:
+                return error_response(f'Method "{request.method}" not allowed.', 405)
+
+            try:
+                user, authenticate_header = await authenticate(request)
+            except exceptions.APIException as e:
+                return error_response(e.detail, e.status_code)
+
+            if not user.is_authenticated:
+                if authenticate_header:
+                    return error_response("Authentication credentials were not provided.", 401,
+                                          headers={"WWW-Authenticate": authenticate_header})
+                return error_response("Authentication credentials were not provided.", 403)
+            if admin and not user.is_staff:
+                return error_response("You do not have permission to perform this action.", 403)
+
+            return await view(request, user, *args, **kwargs)
+
+        # CSRF is enforced by SessionAuthentication like in the DRF views
+        wrapper.csrf_exempt = True
+        return wrapper
+
+    return decorator
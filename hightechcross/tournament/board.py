@@ -0,0 +1,35 @@
+from django.db.models import FilteredRelation, Q
+
+from .models import Task
+
+
+def get_answer_status(solved, wrong_answers):
+    if solved:
+        return "correct"
+    if wrong_answers:
+        return "wrong"
+    return "not started"
+
+
+def build_task_board(db_cross, team):
+    """Builds the task list of a team with its opened hints and answer statuses in a single query."""
+    db_tasks = (Task.objects
+                .filter(cross=db_cross)
+                .annotate(team_standing=FilteredRelation('standing', condition=Q(standing__team=team)))
+                .values_list('id', 'name', 'coordinates', 'description', 'hint1', 'hint2', 'hint3',
+                             'team_standing__solved', 'team_standing__wrong_answers',
+                             'team_standing__hint_number'))
+
+    tasks = []
+    for (task_id, name, coordinates, description, hint1, hint2, hint3,
+         solved, wrong_answers, hint_number) in db_tasks:
+        tasks.append({
+            "id": task_id,
+            "name": name,
+            "coordinates": coordinates,
+            "description": description,
+            "hints": [hint1, hint2, hint3][:hint_number or 0],
+            "status": get_answer_status(solved, wrong_answers)
+        })
+
+    return tasks
@@ -0,0 +1,147 @@
+import asyncio
+import json
+import threading
+
+from django.conf import settings
+from django.core.signals import setting_changed
+from django.dispatch import receiver
+from django.utils.module_loading import import_string
+from rest_framework.utils.encoders import JSONEncoder
+
+SUBSCRIPTION_QUEUE_SIZE = 100
+
+
+class Subscription:
+    async def get(self, timeout=None):
+        """Returns the next message of the channel or None if nothing arrived within the timeout."""
+        raise NotImplementedError
+
+    async def close(self):
+        raise NotImplementedError
+
+
+class Broker:
+    """Fans out messages published by the request handlers to the streaming clients."""
+
+    def publish(self, channel, message):
+        raise NotImplementedError
+
+    def has_subscribers(self, channel):
+        """Tells if publishing to the channel can reach anyone, so building the message is worth it."""
+        return True
+
+    async def subscribe(self, channel):
+        raise NotImplementedError
+
+
+class InProcessSubscription(Subscription):
+    def __init__(self, broker, channel):
+        self.broker = broker
+        self.channel = channel
+        self.loop = asyncio.get_running_loop()
+        self.queue = asyncio.Queue(maxsize=SUBSCRIPTION_QUEUE_SIZE)
+
+    def put(self, message):
+        try:
+            self.queue.put_nowait(message)
+        except asyncio.QueueFull:
+            # The client does not keep up, it will resync from the regular endpoints on reconnect
+            pass
+
+    async def get(self, timeout=None):
+        try:
+            return await asyncio.wait_for(self.queue.get(), timeout)
+        except asyncio.TimeoutError:
+            return None
+
+    async def close(self):
+        self.broker.unsubscribe(self)
+
+
+class InProcessBroker(Broker):
+    """Delivers messages to the subscribers of the current process only."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.subscriptions = {}
+
+    def publish(self, channel, message):
+        with self.lock:
+            subscriptions = list(self.subscriptions.get(channel, ()))
+        for subscription in subscriptions:
+            try:
+                subscription.loop.call_soon_threadsafe(subscription.put, message)
+            except RuntimeError:
+                # The event loop of the subscriber has been closed
+                self.unsubscribe(subscription)
+
+    def has_subscribers(self, channel):
+        with self.lock:
+            return channel in self.subscriptions
+
+    async def subscribe(self, channel):
+        subscription = InProcessSubscription(self, channel)
+        with self.lock:
+            self.subscriptions.setdefault(channel, set()).add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription):
+        with self.lock:
+            subscriptions = self.subscriptions.get(subscription.channel, set())
+            subscriptions.discard(subscription)
+            if not subscriptions:
+                self.subscriptions.pop(subscription.channel, None)
+
+
+class RedisSubscription(Subscription):
+    def __init__(self, pubsub):
+        self.pubsub = pubsub
+
+    async def get(self, timeout=None):
+        message = await self.pubsub.get_message(ignore_subscribe_messages=True, timeout=timeout)
+        if message is None:
+            return None
+        return json.loads(message["data"])
+
+    async def close(self):
+        await self.pubsub.reset()
+
+
+class RedisBroker(Broker):
+    """Delivers messages to the subscribers of all processes through Redis pub/sub."""
+
+    def __init__(self, url=None):
+        import redis
+        import redis.asyncio
+
+        self.url = url or settings.REDIS_URL
+        self.client = redis.Redis.from_url(self.url)
+        self.async_client = redis.asyncio.Redis.from_url(self.url)
+
+    def publish(self, channel, message):
+        self.client.publish(channel, json.dumps(message, cls=JSONEncoder))
+
+    def has_subscribers(self, channel):
+        return any(count for _, count in self.client.pubsub_numsub(channel))
+
+    async def subscribe(self, channel):
+        pubsub = self.async_client.pubsub()
+        await pubsub.subscribe(channel)
+        return RedisSubscription(pubsub)
+
+
+_broker = None
+
+
+def get_broker():
+    global _broker
+    if _broker is None:
+        _broker = import_string(getattr(settings, "TOURNAMENT_BROKER", "tournament.broker.InProcessBroker"))()
+    return _broker
+
+
+@receiver(setting_changed)
+def reset_broker(setting, **kwargs):
+    global _broker
+    if setting == "TOURNAMENT_BROKER":
+        _broker = None
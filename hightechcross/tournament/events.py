@@ -0,0 +1,59 @@
+import datetime
+
+from django.db import transaction
+from django.db.models import Count, Q, Sum
+
+from .board import get_answer_status
+from .broker import get_broker
+from .models import Standing
+
+
+def standings_channel(cross_id):
+    return f"tournament:cross:{cross_id}:standings"
+
+
+def team_channel(cross_id, team_id):
+    return f"tournament:cross:{cross_id}:team:{team_id}"
+
+
+def _team_totals(cross_id, team):
+    return Standing.objects.filter(cross_id=cross_id, team=team).aggregate(
+        completed_tasks=Count('id', filter=Q(solved=True)),
+        penalty_time=Sum('penalty', filter=Q(solved=True), default=datetime.timedelta()),
+    )
+
+
+def publish_standing_on_commit(db_standing, team, db_task):
+    """Publishes the changed standing to the results display and to the team once the transaction commits.
+
+    The messages are only built for channels someone listens to, the team totals cost a query.
+    """
+    cross_id = db_standing.cross_id
+    solved, hint_number, wrong_answers = db_standing.solved, db_standing.hint_number, db_standing.wrong_answers
+
+    def publish():
+        broker = get_broker()
+        channel = standings_channel(cross_id)
+        if broker.has_subscribers(channel):
+            totals = _team_totals(cross_id, team)
+            broker.publish(channel, {
+                "event": "standing",
+                "data": {
+                    "team": team.username,
+                    "task": {"id": db_task.id, "name": db_task.name, "status": solved},
+                    "completed_tasks": totals["completed_tasks"],
+                    "penalty_time": totals["penalty_time"],
+                }
+            })
+        channel = team_channel(cross_id, team.id)
+        if broker.has_subscribers(channel):
+            broker.publish(channel, {
+                "event": "task",
+                "data": {
+                    "id": db_task.id,
+                    "hints": [db_task.hint1, db_task.hint2, db_task.hint3][:hint_number],
+                    "status": get_answer_status(solved, wrong_answers),
+                }
+            })
+
+    transaction.on_commit(publish)
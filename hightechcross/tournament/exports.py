@@ -0,0 +1,69 @@
+import csv
+import datetime
+
+from rest_framework.utils.encoders import JSONEncoder
+
+from .models import Answer
+from .scoring import rank_teams
+
+CHUNK_SIZE = 2000
+EXPORT_KINDS = ('answers', 'standings')
+EXPORT_FORMATS = ('csv', 'ndjson')
+CONTENT_TYPES = {
+    'csv': 'text/csv',
+    'ndjson': 'application/x-ndjson',
+}
+
+ANSWER_COLUMNS = ('id', 'team', 'task', 'task_name', 'answer', 'is_correct', 'submitted_at')
+STANDING_COLUMNS = ('place', 'team', 'completed_tasks', 'penalty_time')
+
+
+def iter_answers(db_cross, chunk_size=CHUNK_SIZE):
+    rows = (Answer.objects
+            .filter(task__cross=db_cross)
+            .order_by('id')
+            .values_list('id', 'team__username', 'task_id', 'task__name', 'answer', 'is_correct', 'submitted_at')
+            .iterator(chunk_size=chunk_size))
+    for row in rows:
+        yield dict(zip(ANSWER_COLUMNS, row))
+
+
+def iter_standings(db_cross):
+    for _, username, completed_tasks, penalty_time, place in rank_teams(db_cross):
+        yield dict(zip(STANDING_COLUMNS, (place, username, completed_tasks, penalty_time)))
+
+
+class Echo:
+    """File-like object returning what is written to it, lets csv.writer produce lines one by one."""
+
+    def write(self, value):
+        return value
+
+
+def _csv_value(value):
+    return JSONEncoder().default(value) if isinstance(value, (datetime.datetime, datetime.timedelta)) else value
+
+
+def render_csv(columns, rows):
+    writer = csv.writer(Echo())
+    yield writer.writerow(columns)
+    for row in rows:
+        yield writer.writerow([_csv_value(row[column]) for column in columns])
+
+
+def render_ndjson(rows):
+    encoder = JSONEncoder(ensure_ascii=False)
+    for row in rows:
+        yield encoder.encode(row) + '\n'
+
+
+def export_cross(db_cross, kind, export_format, chunk_size=CHUNK_SIZE):
+    """Returns a generator of the lines of a cross export, reading the database in chunks."""
+    if kind == 'answers':
+        columns, rows = ANSWER_COLUMNS, iter_answers(db_cross, chunk_size)
+    else:
+        columns, rows = STANDING_COLUMNS, iter_standings(db_cross)
+
+    if export_format == 'csv':
+        return render_csv(columns, rows)
+    return render_ndjson(rows)
@@ -0,0 +1,69 @@
+import datetime
+import time
+
+import pytz
+from django.db import transaction
+from django.db.models import Min
+
+from .active import bump_active_cross_version
+from .models import Cross, StatusChoice
+from .snapshots import freeze_results
+
+POLL_INTERVAL = 60
+
+
+def utc_now():
+    return datetime.datetime.now(tz=pytz.utc)
+
+
+@transaction.atomic
+def finish_cross(db_cross):
+    """Finishes a started cross and freezes its results. Returns False if it is not started anymore."""
+    finished = (Cross.objects
+                .filter(pk=db_cross.pk, status=StatusChoice.STARTED)
+                .update(status=StatusChoice.FINISHED))
+    if not finished:
+        return False
+
+    db_cross.status = StatusChoice.FINISHED
+    bump_active_cross_version()
+    freeze_results(db_cross)
+    return True
+
+
+def finish_due_crosses(now):
+    """Finishes the started crosses whose end time has come and returns them."""
+    return [db_cross for db_cross in Cross.objects.filter(status=StatusChoice.STARTED, end_time__lte=now)
+            if finish_cross(db_cross)]
+
+
+class Finisher:
+    """Finishes crosses at their end time. The clock and sleep functions can be replaced in tests."""
+
+    def __init__(self, clock=utc_now, sleep=time.sleep, poll_interval=POLL_INTERVAL):
+        self.clock = clock
+        self.sleep = sleep
+        self.poll_interval = poll_interval
+
+    def get_delay(self):
+        """Returns the seconds to wait before the next check, never longer than the poll interval
+        so crosses started meanwhile are noticed."""
+        end_time = Cross.objects.filter(status=StatusChoice.STARTED).aggregate(end_time=Min('end_time'))['end_time']
+        if end_time is None:
+            return self.poll_interval
+        return min(self.poll_interval, max(0.0, (end_time - self.clock()).total_seconds()))
+
+    def run_once(self):
+        return finish_due_crosses(self.clock())
+
+    def run(self, iterations=None, on_finish=None):
+        """Checks for due crosses until interrupted, or the given number of times."""
+        checks = 0
+        while True:
+            for db_cross in self.run_once():
+                if on_finish is not None:
+                    on_finish(db_cross)
+            checks += 1
+            if iterations is not None and checks >= iterations:
+                return
+            self.sleep(self.get_delay())
@@ -0,0 +1,103 @@
+import datetime
+
+from django.db.models import Count, Min
+
+from .models import Answer, HintTaken, Standing, Task
+from .roster import get_roster
+from .scoring import rank_results, rank_teams
+
+
+def _assemble_results(db_cross, teams, cells):
+    db_tasks = list(Task.objects.filter(cross=db_cross).values_list('id', 'name'))
+
+    results = []
+    for team_id, username, place in teams:
+        tasks = []
+        completed_tasks = 0
+        penalty_time = datetime.timedelta()
+        for task_id, task_name in db_tasks:
+            solved, penalty = cells.get((team_id, task_id), (False, None))
+            if solved:
+                completed_tasks += 1
+                penalty_time += penalty
+
+            tasks.append({
+                "name": task_name,
+                "status": solved
+            })
+
+        results.append({
+            "place": place,
+            "team": username,
+            "completed_tasks": completed_tasks,
+            "penalty_time": penalty_time,
+            "tasks": tasks
+        })
+
+    return results
+
+
+def build_results(db_cross):
+    """Builds the ranked standings of all teams from the materialized Standing rows."""
+    cells = {
+        (team_id, task_id): (solved, penalty)
+        for team_id, task_id, solved, penalty in Standing.objects
+            .filter(cross=db_cross)
+            .values_list('team_id', 'task_id', 'solved', 'penalty')
+    }
+    teams = [(team_id, username, place) for team_id, username, _, _, place in rank_teams(db_cross)]
+    return _assemble_results(db_cross, teams, cells)
+
+
+def build_history_standings(db_cross):
+    """Computes unsaved Standing rows from the raw answer and hint history."""
+    solved = {
+        (team_id, task_id): (answer_id, submitted_at)
+        for team_id, task_id, answer_id, submitted_at in Answer.objects
+            .filter(task__cross=db_cross, is_correct=True)
+            .values('team_id', 'task_id')
+            .annotate(answer_id=Min('id'), submitted_at=Min('submitted_at'))
+            .values_list('team_id', 'task_id', 'answer_id', 'submitted_at')
+    }
+    solved_answer_texts = dict(Answer.objects
+                               .filter(id__in=[answer_id for answer_id, _ in solved.values()])
+                               .values_list('id', 'answer'))
+    wrong_answers = {
+        (team_id, task_id): count
+        for team_id, task_id, count in Answer.objects
+            .filter(task__cross=db_cross, is_correct=False)
+            .values('team_id', 'task_id')
+            .annotate(count=Count('id'))
+            .values_list('team_id', 'task_id', 'count')
+    }
+    hints_taken = {
+        (team_id, task_id): hint_number
+        for team_id, task_id, hint_number in HintTaken.objects
+            .filter(task__cross=db_cross)
+            .values_list('team_id', 'task_id', 'hint_number')
+    }
+
+    standings = []
+    for team_id, task_id in solved.keys() | wrong_answers.keys() | hints_taken.keys():
+        key = (team_id, task_id)
+        solved_answer_id, solved_at = solved.get(key, (None, None))
+        hint_number = hints_taken.get(key, 0)
+        wrong_count = wrong_answers.get(key, 0)
+        standings.append(Standing(
+            cross=db_cross, team_id=team_id, task_id=task_id,
+            solved=solved_at is not None, solved_at=solved_at, solved_answer_id=solved_answer_id,
+            solved_answer_text=solved_answer_texts.get(solved_answer_id),
+            wrong_answers=wrong_count, hint_number=hint_number,
+            penalty=db_cross.rules.penalty(db_cross.start_time, solved_at, hint_number, wrong_count),
+        ))
+    return standings
+
+
+def build_history_results(db_cross):
+    """Builds the ranked standings of all teams directly from the answer and hint history."""
+    cells = {
+        (db_standing.team_id, db_standing.task_id): (db_standing.solved, db_standing.penalty)
+        for db_standing in build_history_standings(db_cross)
+    }
+    teams = [(team_id, username, None) for team_id, username in get_roster()]
+    return rank_results(_assemble_results(db_cross, teams, cells))
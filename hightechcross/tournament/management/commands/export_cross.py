@@ -0,0 +1,30 @@
+import sys
+
+from django.core.management.base import BaseCommand, CommandError
+
+from tournament.exports import CHUNK_SIZE, EXPORT_FORMATS, EXPORT_KINDS, export_cross
+from tournament.models import Cross
+
+
+class Command(BaseCommand):
+    help = "Streams the answers or the standings of a cross as CSV or NDJSON"
+
+    def add_arguments(self, parser):
+        parser.add_argument("cross_id", type=int)
+        parser.add_argument("--kind", choices=EXPORT_KINDS, default="answers")
+        parser.add_argument("--format", dest="export_format", choices=EXPORT_FORMATS, default="csv")
+        parser.add_argument("--output", help="File to write to, the standard output by default")
+        parser.add_argument("--chunk-size", type=int, default=CHUNK_SIZE)
+
+    def handle(self, *args, cross_id, kind, export_format, output, chunk_size, **options):
+        try:
+            db_cross = Cross.objects.get(pk=cross_id)
+        except Cross.DoesNotExist:
+            raise CommandError(f"Cross {cross_id} not found")
+
+        lines = export_cross(db_cross, kind, export_format, chunk_size=chunk_size)
+        if output:
+            with open(output, "w", encoding="utf-8", newline="") as file:
+                file.writelines(lines)
+        else:
+            sys.stdout.writelines(lines)
@@ -0,0 +1,18 @@
+from django.core.management.base import BaseCommand
+
+from tournament.finisher import POLL_INTERVAL, Finisher
+
+
+class Command(BaseCommand):
+    help = "Finishes started crosses at their end time and freezes their final results"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--once", action="store_true",
+                            help="Finish the crosses that are due and exit instead of running as a worker")
+        parser.add_argument("--poll-interval", type=float, default=POLL_INTERVAL,
+                            help="Longest time in seconds between two checks for started crosses")
+
+    def handle(self, *args, once, poll_interval, **options):
+        finisher = Finisher(poll_interval=poll_interval)
+        finisher.run(iterations=1 if once else None,
+                     on_finish=lambda db_cross: self.stdout.write(f"Cross {db_cross.id}: finished"))
@@ -0,0 +1,34 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from tournament.leaderboard import build_history_results, build_results
+from tournament.models import Cross, StatusChoice
+from tournament.standings import rebuild_standings
+
+
+class Command(BaseCommand):
+    help = "Rebuilds the standings table from the answer and hint history and checks it against the results"
+
+    def add_arguments(self, parser):
+        parser.add_argument("cross_ids", nargs="*", type=int,
+                            help="Crosses to rebuild. All started and finished crosses by default")
+        parser.add_argument("--check", action="store_true",
+                            help="Only compare the stored standings with the history without rebuilding them")
+
+    def handle(self, *args, cross_ids, check, **options):
+        db_crosses = Cross.objects.exclude(status=StatusChoice.CREATED).order_by("id")
+        if cross_ids:
+            db_crosses = db_crosses.filter(pk__in=cross_ids)
+
+        mismatches = []
+        for db_cross in db_crosses:
+            if not check:
+                rebuild_standings(db_cross)
+
+            if build_results(db_cross) == build_history_results(db_cross):
+                self.stdout.write(f"Cross {db_cross.id}: standings match")
+            else:
+                mismatches.append(db_cross.id)
+                self.stderr.write(f"Cross {db_cross.id}: standings do not match the answer history")
+
+        if mismatches:
+            raise CommandError(f"Standings mismatch for crosses: {', '.join(map(str, mismatches))}")
@@ -0,0 +1,39 @@
+# Generated by Django 4.2.30 on 2026-10-18 17:32
+
+import datetime
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('tournament', '0002_hinttaken_unique_hint_taken'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Standing',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('solved', models.BooleanField(default=False)),
+                ('solved_at', models.DateTimeField(default=None, null=True)),
+                ('wrong_answers', models.IntegerField(default=0)),
+                ('hint_number', models.IntegerField(default=0)),
+                ('penalty', models.DurationField(default=datetime.timedelta)),
+                ('cross', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='standings', to='tournament.cross')),
+                ('task', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='tournament.task')),
+                ('team', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'default_permissions': (),
+                'indexes': [models.Index(fields=['cross', 'team'], name='standing_cross_team_idx')],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='standing',
+            constraint=models.UniqueConstraint(fields=('task', 'team'), name='unique_standing'),
+        ),
+    ]
@@ -0,0 +1,39 @@
+# Generated by Django 4.2.30 on 2026-10-18 17:39
+
+from django.db import migrations, models
+from django.db.models import Count, Min
+import django.db.models.deletion
+
+
+def delete_duplicate_answers(apps, schema_editor):
+    # Concurrent submissions could store the same answer twice, keep the first one
+    Answer = apps.get_model('tournament', 'Answer')
+    duplicates = (Answer.objects
+                  .values('task', 'team', 'answer')
+                  .annotate(first_id=Min('id'), count=Count('id'))
+                  .filter(count__gt=1))
+    for duplicate in duplicates:
+        (Answer.objects
+         .filter(task=duplicate['task'], team=duplicate['team'], answer=duplicate['answer'])
+         .exclude(id=duplicate['first_id'])
+         .delete())
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tournament', '0003_standing'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='standing',
+            name='solved_answer',
+            field=models.ForeignKey(default=None, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='tournament.answer'),
+        ),
+        migrations.RunPython(delete_duplicate_answers, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name='answer',
+            constraint=models.UniqueConstraint(fields=('task', 'team', 'answer'), name='unique_answer'),
+        ),
+    ]
@@ -0,0 +1,35 @@
+# Generated by Django 4.2.30 on 2026-10-18 17:40
+
+from django.db import migrations, models
+import tournament.models
+
+
+def finish_extra_started_crosses(apps, schema_editor):
+    # Only the latest started cross stays started so that the unique index can be built
+    Cross = apps.get_model('tournament', 'Cross')
+    started = Cross.objects.filter(status='started').order_by('-start_time', '-id')
+    extra_ids = list(started.values_list('id', flat=True)[1:])
+    Cross.objects.filter(id__in=extra_ids).update(status='finished')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tournament', '0004_unique_answer'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='answer',
+            index=models.Index(fields=['task', 'team', 'is_correct'], name='answer_task_team_correct_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='answer',
+            index=models.Index(condition=models.Q(('is_correct', True)), fields=['task', 'team'], name='answer_correct_idx'),
+        ),
+        migrations.RunPython(finish_extra_started_crosses, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name='cross',
+            constraint=models.UniqueConstraint(condition=models.Q(('status', tournament.models.StatusChoice['STARTED'])), fields=('status',), name='unique_started_cross'),
+        ),
+    ]
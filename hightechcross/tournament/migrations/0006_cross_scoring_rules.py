@@ -0,0 +1,34 @@
+# Generated by Django 4.2.30 on 2026-10-18 17:51
+
+import datetime
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tournament', '0005_hot_query_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='cross',
+            name='duration',
+            field=models.DurationField(default=datetime.timedelta(seconds=1200)),
+        ),
+        migrations.AddField(
+            model_name='cross',
+            name='hint_penalty',
+            field=models.DurationField(default=datetime.timedelta(seconds=900)),
+        ),
+        migrations.AddField(
+            model_name='cross',
+            name='normalize_answers',
+            field=models.BooleanField(default=False),
+        ),
+        migrations.AddField(
+            model_name='cross',
+            name='wrong_answer_penalty',
+            field=models.DurationField(default=datetime.timedelta(seconds=1800)),
+        ),
+    ]
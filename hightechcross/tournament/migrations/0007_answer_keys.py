@@ -0,0 +1,78 @@
+# Generated by Django 4.2.30 on 2026-10-18 17:55
+
+from django.db import migrations, models
+from django.db.models import F
+import django.db.models.deletion
+
+from tournament.rules import normalize_answer
+
+
+def fill_answer_keys(apps, schema_editor):
+    Answer = apps.get_model('tournament', 'Answer')
+    AnswerKey = apps.get_model('tournament', 'AnswerKey')
+    Task = apps.get_model('tournament', 'Task')
+
+    Answer.objects.filter(task__cross__normalize_answers=False).update(answer_key=F('answer'))
+    # Variants of one answer become duplicates once normalized, keep the first one
+    seen = set()
+    for answer_id, task_id, team_id, answer in (Answer.objects
+                                                .filter(task__cross__normalize_answers=True)
+                                                .order_by('id')
+                                                .values_list('id', 'task_id', 'team_id', 'answer')
+                                                .iterator()):
+        key = normalize_answer(answer)
+        if (task_id, team_id, key) in seen:
+            Answer.objects.filter(id=answer_id).delete()
+        else:
+            seen.add((task_id, team_id, key))
+            Answer.objects.filter(id=answer_id).update(answer_key=key)
+
+    AnswerKey.objects.bulk_create([
+        AnswerKey(task_id=task_id, key=normalize_answer(correct_answer) if normalize else correct_answer)
+        for task_id, correct_answer, normalize in Task.objects.values_list(
+            'id', 'correct_answer', 'cross__normalize_answers').iterator()
+    ], batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tournament', '0006_cross_scoring_rules'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AnswerKey',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('key', models.CharField(max_length=255)),
+                ('task', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='answer_keys', to='tournament.task')),
+            ],
+            options={
+                'default_permissions': (),
+            },
+        ),
+        migrations.AddField(
+            model_name='answer',
+            name='answer_key',
+            field=models.CharField(default=None, max_length=255, null=True),
+        ),
+        migrations.AddField(
+            model_name='task',
+            name='alternative_answers',
+            field=models.JSONField(blank=True, default=list),
+        ),
+        migrations.RunPython(fill_answer_keys, migrations.RunPython.noop),
+        migrations.RemoveConstraint(
+            model_name='answer',
+            name='unique_answer',
+        ),
+        migrations.AddConstraint(
+            model_name='answer',
+            constraint=models.UniqueConstraint(fields=('task', 'team', 'answer_key'), name='unique_answer_key_per_team'),
+        ),
+        migrations.AddConstraint(
+            model_name='answerkey',
+            constraint=models.UniqueConstraint(fields=('task', 'key'), name='unique_answer_key'),
+        ),
+    ]
@@ -0,0 +1,26 @@
+# Generated by Django 4.2.30 on 2026-10-18 17:57
+
+import django.core.serializers.json
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tournament', '0007_answer_keys'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='FinalResults',
+            fields=[
+                ('cross', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='final_results', serialize=False, to='tournament.cross')),
+                ('results', models.JSONField(encoder=django.core.serializers.json.DjangoJSONEncoder)),
+                ('frozen_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'default_permissions': (),
+            },
+        ),
+    ]
@@ -0,0 +1,21 @@
+# Generated by Django 4.2.30 on 2026-10-18 19:01
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tournament', '0008_final_results'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='answer',
+            name='answer_task_team_correct_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='answer',
+            name='answer_correct_idx',
+        ),
+    ]
@@ -0,0 +1,27 @@
+# Generated by Django 4.2.30 on 2026-10-18 19:03
+
+from django.db import migrations, models
+from django.db.models import OuterRef, Subquery
+
+
+def fill_solved_answer_texts(apps, schema_editor):
+    Answer = apps.get_model('tournament', 'Answer')
+    Standing = apps.get_model('tournament', 'Standing')
+    Standing.objects.filter(solved_answer__isnull=False).update(solved_answer_text=Subquery(
+        Answer.objects.filter(pk=OuterRef('solved_answer_id')).values('answer')[:1]))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tournament', '0009_drop_answer_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='standing',
+            name='solved_answer_text',
+            field=models.CharField(default=None, max_length=255, null=True),
+        ),
+        migrations.RunPython(fill_solved_answer_texts, migrations.RunPython.noop),
+    ]
@@ -1,8 +1,14 @@
+import datetime
 from enum import Enum
+from functools import cached_property
 
 from django.contrib.auth.models import User
+from django.core.serializers.json import DjangoJSONEncoder
 from django.db import models
 
+from .rules import (DEFAULT_DURATION, DEFAULT_HINT_PENALTY, DEFAULT_WRONG_ANSWER_PENALTY,
+                    ScoringRules)
+
 
 class StatusChoice(str, Enum):
     CREATED = 'created'
@@ -26,9 +32,30 @@ class Cross(models.Model):
     end_time = models.DateTimeField(default=None, null=True)
     status = models.CharField(max_length=255, choices=StatusChoice.choices(),
         default=StatusChoice.CREATED)
+    duration = models.DurationField(default=DEFAULT_DURATION)
+    hint_penalty = models.DurationField(default=DEFAULT_HINT_PENALTY)
+    wrong_answer_penalty = models.DurationField(default=DEFAULT_WRONG_ANSWER_PENALTY)
+    normalize_answers = models.BooleanField(default=False)
+
+    @cached_property
+    def rules(self):
+        """The compiled scoring rules, kept on the instance until it is saved or reloaded."""
+        return ScoringRules.from_cross(self)
+
+    def save(self, *args, **kwargs):
+        self.__dict__.pop('rules', None)
+        super().save(*args, **kwargs)
+
+    def refresh_from_db(self, *args, **kwargs):
+        self.__dict__.pop('rules', None)
+        super().refresh_from_db(*args, **kwargs)
 
     class Meta:
         default_permissions = ()
+        constraints = [
+            models.UniqueConstraint(fields=['status'], condition=models.Q(status=StatusChoice.STARTED),
+                                    name='unique_started_cross')
+        ]
 
 class Task(models.Model):
     cross = models.ForeignKey(Cross, on_delete=models.CASCADE, related_name='tasks')
@@ -39,9 +66,20 @@ class Task(models.Model):
     hint1 = models.CharField(max_length=300)
     hint2 = models.CharField(max_length=300)
     hint3 = models.CharField(max_length=300)
+    alternative_answers = models.JSONField(default=list, blank=True)
+
+    class Meta:
+        default_permissions = ()
+
+class AnswerKey(models.Model):
+    task = models.ForeignKey(Task, on_delete=models.CASCADE, related_name='answer_keys')
+    key = models.CharField(max_length=255)
 
     class Meta:
         default_permissions = ()
+        constraints = [
+            models.UniqueConstraint(fields=['task', 'key'], name='unique_answer_key')
+        ]
 
 class HintTaken(models.Model):
     hint_number = models.IntegerField(default=0)
@@ -58,8 +96,42 @@ class Answer(models.Model):
     team = models.ForeignKey(User, on_delete=models.CASCADE)
     task = models.ForeignKey(Task, on_delete=models.CASCADE)
     answer = models.CharField(max_length=255)
+    answer_key = models.CharField(max_length=255, default=None, null=True)
     submitted_at = models.DateTimeField(auto_now_add=True)
     is_correct = models.BooleanField(default=False)
 
     class Meta:
         default_permissions = ()
+        constraints = [
+            models.UniqueConstraint(fields=['task', 'team', 'answer_key'], name='unique_answer_key_per_team')
+        ]
+
+class Standing(models.Model):
+    cross = models.ForeignKey(Cross, on_delete=models.CASCADE, related_name='standings')
+    team = models.ForeignKey(User, on_delete=models.CASCADE)
+    task = models.ForeignKey(Task, on_delete=models.CASCADE)
+    solved = models.BooleanField(default=False)
+    solved_at = models.DateTimeField(default=None, null=True)
+    solved_answer = models.ForeignKey('Answer', on_delete=models.SET_NULL, default=None, null=True,
+                                      related_name='+')
+    solved_answer_text = models.CharField(max_length=255, default=None, null=True)
+    wrong_answers = models.IntegerField(default=0)
+    hint_number = models.IntegerField(default=0)
+    penalty = models.DurationField(default=datetime.timedelta)
+
+    class Meta:
+        default_permissions = ()
+        constraints = [
+            models.UniqueConstraint(fields=['task', 'team'], name='unique_standing')
+        ]
+        indexes = [
+            models.Index(fields=['cross', 'team'], name='standing_cross_team_idx')
+        ]
+
+class FinalResults(models.Model):
+    cross = models.OneToOneField(Cross, on_delete=models.CASCADE, primary_key=True, related_name='final_results')
+    results = models.JSONField(encoder=DjangoJSONEncoder)
+    frozen_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        default_permissions = ()
@@ -0,0 +1,56 @@
+from collections import defaultdict
+
+from django.utils.duration import duration_string
+
+from .models import Task
+
+CROSS_FIELDS = ('id', 'tasks', 'start_time', 'end_time', 'status', 'duration', 'hint_penalty',
+                'wrong_answer_penalty', 'normalize_answers')
+CROSS_COLUMNS = ('id', 'start_time', 'end_time', 'status', 'duration', 'hint_penalty', 'wrong_answer_penalty',
+                 'normalize_answers')
+CROSS_HEADER_FIELDS = ('id', 'start_time', 'end_time', 'status')
+CROSS_DURATION_FIELDS = ('duration', 'hint_penalty', 'wrong_answer_penalty')
+TASK_FIELDS = ('id', 'cross', 'name', 'coordinates', 'description', 'correct_answer', 'hint1', 'hint2', 'hint3',
+               'alternative_answers')
+TASK_COLUMNS = ('id', 'cross_id', 'name', 'coordinates', 'description', 'correct_answer', 'hint1', 'hint2', 'hint3',
+                'alternative_answers')
+
+
+def project_tasks(cross_ids):
+    """Returns the tasks of the crosses as TaskSerializer shaped dicts grouped by cross id."""
+    tasks = defaultdict(list)
+    for row in Task.objects.filter(cross__in=cross_ids).values_list(*TASK_COLUMNS):
+        task = dict(zip(TASK_FIELDS, row))
+        tasks[task['cross']].append(task)
+    return tasks
+
+
+def project_crosses(rows, fields=CROSS_FIELDS):
+    """Turns rows of Cross.objects.values(*CROSS_COLUMNS) into CrossSerializer shaped dicts."""
+    fields = [field for field in CROSS_FIELDS if field in fields]
+    tasks = project_tasks([row['id'] for row in rows]) if 'tasks' in fields else {}
+
+    crosses = []
+    for row in rows:
+        cross = {}
+        for field in fields:
+            if field == 'tasks':
+                cross[field] = tasks.get(row['id'], [])
+            elif field in CROSS_DURATION_FIELDS:
+                cross[field] = duration_string(row[field])
+            else:
+                cross[field] = row[field]
+        crosses.append(cross)
+    return crosses
+
+
+def project_answer(db_answer):
+    """Returns the AnswerSerializer shaped dict of an answer."""
+    return {
+        'id': db_answer.id,
+        'answer': db_answer.answer,
+        'submitted_at': db_answer.submitted_at,
+        'is_correct': db_answer.is_correct,
+        'team': db_answer.team_id,
+        'task': db_answer.task_id,
+    }
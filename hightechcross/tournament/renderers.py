@@ -0,0 +1,17 @@
+from rest_framework.renderers import JSONRenderer
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+class FastJSONRenderer(JSONRenderer):
+    """Renders compact JSON with orjson when it is installed, with the same output as JSONRenderer."""
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if orjson is None or data is None or self.get_indent(accepted_media_type, renderer_context or {}):
+            return super().render(data, accepted_media_type, renderer_context)
+
+        return orjson.dumps(data, default=self.encoder_class().default,
+                            option=orjson.OPT_UTC_Z | orjson.OPT_NON_STR_KEYS)
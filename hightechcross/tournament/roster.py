@@ -0,0 +1,46 @@
+import datetime
+
+from django.core.cache import cache
+from django.db import transaction
+from shared.routers import read_from_primary
+from shared.versions import bump_version, get_version
+
+from .models import User
+
+TEAM_GROUP = 'user'
+VERSION_KEY = "tournament:roster:version"
+MODIFIED_KEY = "tournament:roster:modified"
+ROSTER_KEY = "tournament:roster:{version}"
+ROSTER_TIMEOUT = 60 * 60
+
+
+def _bump_roster_version():
+    bump_version(VERSION_KEY)
+    cache.set(MODIFIED_KEY, datetime.datetime.now(tz=datetime.timezone.utc), timeout=None)
+
+
+def bump_roster_version():
+    """Invalidates the roster now and once more after the transaction commits, like the active cross."""
+    _bump_roster_version()
+    transaction.on_commit(_bump_roster_version)
+
+
+def get_roster_version():
+    """Returns the current (version, last modified time) of the roster."""
+    version = get_version(VERSION_KEY)
+    cache.add(MODIFIED_KEY, datetime.datetime.now(tz=datetime.timezone.utc), timeout=None)
+    return version, cache.get(MODIFIED_KEY)
+
+
+def get_roster():
+    """Returns the (id, username) of all teams ordered by username, cached until the teams change."""
+    key = ROSTER_KEY.format(version=get_version(VERSION_KEY))
+    roster = cache.get(key)
+    if roster is None:
+        with read_from_primary():
+            roster = list(User.objects
+                          .filter(groups__name=TEAM_GROUP)
+                          .order_by('username')
+                          .values_list('id', 'username'))
+        cache.set(key, roster, timeout=ROSTER_TIMEOUT)
+    return roster
@@ -0,0 +1,46 @@
+import datetime
+import unicodedata
+from dataclasses import dataclass
+from functools import lru_cache
+
+DEFAULT_DURATION = datetime.timedelta(minutes=20)
+DEFAULT_HINT_PENALTY = datetime.timedelta(minutes=15)
+DEFAULT_WRONG_ANSWER_PENALTY = datetime.timedelta(minutes=30)
+
+
+def normalize_answer(answer):
+    """Returns the form of an answer that ignores case, Unicode compatibility variants and extra whitespace."""
+    answer = unicodedata.normalize("NFKC", unicodedata.normalize("NFKC", answer).casefold())
+    return " ".join(answer.split())
+
+
+@dataclass(frozen=True)
+class ScoringRules:
+    """Scoring configuration of a cross compiled once, shared by all requests using the cross."""
+
+    duration: datetime.timedelta = DEFAULT_DURATION
+    hint_penalty: datetime.timedelta = DEFAULT_HINT_PENALTY
+    wrong_answer_penalty: datetime.timedelta = DEFAULT_WRONG_ANSWER_PENALTY
+    normalize_answers: bool = False
+
+    @classmethod
+    def from_cross(cls, db_cross):
+        return compile_rules(db_cross.duration, db_cross.hint_penalty, db_cross.wrong_answer_penalty,
+                             db_cross.normalize_answers)
+
+    def penalty(self, start_time, solved_at, hint_number, wrong_answers):
+        if solved_at is None:
+            return datetime.timedelta()
+        return (solved_at - start_time
+                + self.hint_penalty * hint_number
+                + self.wrong_answer_penalty * wrong_answers)
+
+    def answer_key(self, answer):
+        """Returns the key answers are matched and deduplicated by."""
+        return normalize_answer(answer) if self.normalize_answers else answer
+
+
+@lru_cache(maxsize=128)
+def compile_rules(duration, hint_penalty, wrong_answer_penalty, normalize_answers):
+    """Returns the shared rules object for a configuration, crosses with equal settings get the same one."""
+    return ScoringRules(duration, hint_penalty, wrong_answer_penalty, normalize_answers)
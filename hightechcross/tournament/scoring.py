@@ -0,0 +1,41 @@
+import datetime
+
+from django.db.models import Count, F, Sum, Window
+from django.db.models.functions import Rank
+
+from .models import Standing
+from .roster import get_roster
+
+
+def rank_teams(db_cross):
+    """Returns the (id, username, completed tasks, penalty, place) of the teams of a cross in ranking order.
+
+    The places of the teams that solved something are computed in one query, teams with equal scores
+    share the place and are ordered by name.
+    """
+    roster = get_roster()
+    scores = {
+        team_id: (completed_tasks, penalty_time, place)
+        for team_id, completed_tasks, penalty_time, place in Standing.objects
+            .filter(cross=db_cross, solved=True, team_id__in=[team_id for team_id, _ in roster])
+            .values('team_id')
+            .annotate(completed_tasks=Count('id'), penalty_time=Sum('penalty'))
+            .annotate(place=Window(Rank(), order_by=[F('completed_tasks').desc(), F('penalty_time').asc()]))
+            .values_list('team_id', 'completed_tasks', 'penalty_time', 'place')
+    }
+    unranked = (0, datetime.timedelta(), len(scores) + 1)
+    teams = [(team_id, username, *scores.get(team_id, unranked)) for team_id, username in roster]
+    teams.sort(key=lambda team: (team[4], team[1]))
+    return teams
+
+
+def rank_results(results):
+    """Sorts results computed in Python and sets their places the same way rank_teams does."""
+    results.sort(key=lambda result: (-result["completed_tasks"], result["penalty_time"], result["team"]))
+    previous = None
+    for position, result in enumerate(results, start=1):
+        score = (result["completed_tasks"], result["penalty_time"])
+        if score != previous:
+            place, previous = position, score
+        result["place"] = place
+    return results
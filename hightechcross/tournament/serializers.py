@@ -1,6 +1,7 @@
 from django.db import transaction
 from rest_framework import serializers
 
+from .answers import save_answer_keys
 from .models import Answer, Cross, HintTaken, StatusChoice, Task
 
 
@@ -13,12 +14,38 @@ class TaskSerializer(serializers.ModelSerializer):
     hint1 = serializers.CharField(max_length=300, required=True)
     hint2 = serializers.CharField(max_length=300, required=True)
     hint3 = serializers.CharField(max_length=300, required=True)
+    alternative_answers = serializers.ListField(child=serializers.CharField(max_length=255), default=list)
 
     class Meta:
         model = Task
         fields = '__all__'
 
 
+BATCH_SIZE = 500
+
+
+def build_tasks(db_cross, tasks):
+    return [Task(**task, cross=db_cross) for task in tasks]
+
+
+class CrossListSerializer(serializers.ListSerializer):
+    @transaction.atomic
+    def create(self, validated_data):
+        db_crosses = Cross.objects.bulk_create(
+            [Cross(**{key: value for key, value in cross.items() if key != 'tasks'}) for cross in validated_data],
+            batch_size=BATCH_SIZE)
+
+        db_tasks = []
+        for db_cross, cross in zip(db_crosses, validated_data):
+            db_tasks.extend(build_tasks(db_cross, cross.get('tasks', [])))
+            if len(db_tasks) >= BATCH_SIZE:
+                save_answer_keys(Task.objects.bulk_create(db_tasks, batch_size=BATCH_SIZE))
+                db_tasks = []
+        save_answer_keys(Task.objects.bulk_create(db_tasks, batch_size=BATCH_SIZE))
+
+        return db_crosses
+
+
 class CrossSerializer(serializers.ModelSerializer):
     tasks = TaskSerializer(many=True, required=True)
     start_time = serializers.DateTimeField(default=None, read_only=True)
@@ -31,17 +58,25 @@ class CrossSerializer(serializers.ModelSerializer):
         model = Cross
         fields = '__all__'
         read_only_fields = ['start_time', 'end_time', 'status']
+        list_serializer_class = CrossListSerializer
 
     @transaction.atomic
     def create(self, validated_data):
         tasks = validated_data.pop('tasks', [])
         db_cross = Cross.objects.create(**validated_data)
+        save_answer_keys(Task.objects.bulk_create(build_tasks(db_cross, tasks), batch_size=BATCH_SIZE))
+        return db_cross
 
-        for task in tasks:
-            Task.objects.create(**task, cross=db_cross)
 
-        db_cross.save()
-        return db_cross
+class CrossScoringSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = Cross
+        fields = ['hint_penalty', 'wrong_answer_penalty']
+
+
+class CrossImportSerializer(serializers.Serializer):
+    crosses = serializers.ListField(child=serializers.IntegerField(), read_only=True)
+    tasks = serializers.IntegerField(read_only=True)
 
 
 class AnswerSerializer(serializers.ModelSerializer):
@@ -51,7 +86,7 @@ class AnswerSerializer(serializers.ModelSerializer):
 
     class Meta:
         model = Answer
-        fields = '__all__'
+        exclude = ['answer_key']
 
 
 class HintTakenSerializer(serializers.ModelSerializer):
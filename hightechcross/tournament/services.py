@@ -0,0 +1,96 @@
+import datetime
+
+import pytz
+from django.db import IntegrityError, transaction
+from django.db.models import F, Value
+from django.db.models.functions import Greatest
+from rest_framework import status
+
+from .answers import is_accepted
+from .models import Answer, HintTaken, Standing, StatusChoice
+from .standings import record_answer, record_hint
+
+
+class HintNotAvailable(Exception):
+    def __init__(self, opened_hints):
+        super().__init__(f"Firstly you should open the {opened_hints} hint")
+        self.opened_hints = opened_hints
+
+
+def check_cross_open(db_cross, for_answers=False):
+    """Returns the (detail, status) error for a cross that does not accept team actions, otherwise None."""
+    if for_answers and db_cross.status == StatusChoice.FINISHED:
+        return "Cross finished", status.HTTP_400_BAD_REQUEST
+
+    if db_cross.status != StatusChoice.STARTED:
+        return "Cross not started", status.HTTP_405_METHOD_NOT_ALLOWED
+
+    if for_answers and datetime.datetime.now(tz=pytz.utc) > db_cross.end_time:
+        return "Cross finished", status.HTTP_400_BAD_REQUEST
+
+    return None
+
+
+def get_solved_answer(team, db_task):
+    """Returns the stored answer that solved the task for the team, rebuilt from its standing alone."""
+    row = (Standing.objects
+           .filter(task=db_task, team=team, solved=True, solved_answer__isnull=False)
+           .values_list('solved_answer_id', 'solved_answer_text', 'solved_at')
+           .first())
+    if row is None:
+        return None
+    answer_id, answer, submitted_at = row
+    return Answer(id=answer_id, team=team, task=db_task, answer=answer, submitted_at=submitted_at, is_correct=True)
+
+
+@transaction.atomic
+def create_answer(team, db_task, answer, answer_key):
+    db_answer = Answer.objects.create(team=team, task=db_task, answer=answer, answer_key=answer_key,
+                                      is_correct=is_accepted(db_task, answer_key))
+    record_answer(db_answer)
+    return db_answer
+
+
+def submit_answer(team, db_task, answer):
+    """Stores the answer of the team and returns it, or returns the already stored one.
+
+    Answers are matched by their keys, so variants of a stored answer are not stored again.
+    Answers to solved tasks are not stored anymore, the answer that solved it is returned instead.
+    """
+    db_answer = get_solved_answer(team, db_task)
+    if db_answer is not None:
+        return db_answer
+
+    answer_key = db_task.cross.rules.answer_key(answer)
+    try:
+        return create_answer(team, db_task, answer, answer_key)
+    except IntegrityError:
+        # The same answer has already been submitted, maybe by a concurrent request.
+        # Any other integrity error is not a duplicate and is raised
+        db_answer = Answer.objects.filter(task=db_task, team=team, answer_key=answer_key).first()
+        if db_answer is None:
+            raise
+        return db_answer
+
+
+@transaction.atomic
+def open_hint(team, db_task, hint_number):
+    """Opens the hint with the zero-based number for the team and returns its text.
+
+    Concurrent requests never lose an opened hint: the counter only grows in a single conditional UPDATE.
+    """
+    opened = (HintTaken.objects
+              .filter(team=team, task=db_task, hint_number__gte=hint_number)
+              .update(hint_number=Greatest(F('hint_number'), Value(hint_number + 1))))
+    if not opened:
+        if hint_number > 0:
+            raise HintNotAvailable(HintTaken.objects
+                                   .filter(team=team, task=db_task)
+                                   .values_list('hint_number', flat=True)
+                                   .first() or 0)
+        # A concurrent request may insert the row first, it opens the same first hint
+        HintTaken.objects.bulk_create([HintTaken(team=team, task=db_task, hint_number=1)], ignore_conflicts=True)
+
+    record_hint(team, db_task, hint_number + 1)
+
+    return [db_task.hint1, db_task.hint2, db_task.hint3][hint_number]
@@ -0,0 +1,66 @@
+from django.contrib.auth.models import Group
+from django.db.models.signals import m2m_changed, post_delete, post_save
+from django.dispatch import receiver
+from rest_framework.authtoken.models import Token
+from shared.authentication import invalidate_user_tokens
+
+from .active import bump_active_cross_version
+from .answers import save_answer_keys
+from .models import Cross, Task, User
+from .roster import bump_roster_version
+
+
+@receiver(post_save, sender=Cross)
+@receiver(post_delete, sender=Cross)
+@receiver(post_save, sender=Task)
+@receiver(post_delete, sender=Task)
+def invalidate_active_cross(**kwargs):
+    bump_active_cross_version()
+
+
+@receiver(post_save, sender=Task)
+def update_answer_keys(instance, raw=False, **kwargs):
+    if not raw:
+        save_answer_keys([instance])
+
+
+@receiver(post_save, sender=Token)
+@receiver(post_delete, sender=Token)
+def invalidate_token(instance, **kwargs):
+    # Logging out and rotating a token delete the old one
+    invalidate_user_tokens(instance.user_id)
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def invalidate_user(instance, **kwargs):
+    invalidate_user_tokens(instance.id)
+
+
+@receiver(m2m_changed, sender=User.groups.through)
+def invalidate_user_groups(instance, action, reverse, pk_set, **kwargs):
+    if action not in ("post_add", "post_remove", "pre_clear"):
+        return
+    user_ids = (pk_set or instance.user_set.values_list("id", flat=True)) if reverse else [instance.id]
+    for user_id in user_ids:
+        invalidate_user_tokens(user_id)
+
+
+@receiver(post_save, sender=User)
+def invalidate_roster_on_rename(update_fields=None, **kwargs):
+    # Logging in only updates last_login
+    if update_fields is None or 'username' in update_fields:
+        bump_roster_version()
+
+
+@receiver(post_delete, sender=User)
+@receiver(post_save, sender=Group)
+@receiver(post_delete, sender=Group)
+def invalidate_roster(**kwargs):
+    bump_roster_version()
+
+
+@receiver(m2m_changed, sender=User.groups.through)
+def invalidate_roster_memberships(action, **kwargs):
+    if action.startswith("post_"):
+        bump_roster_version()
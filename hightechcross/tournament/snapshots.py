@@ -0,0 +1,79 @@
+import datetime
+
+from django.core.cache import cache
+from django.db import transaction
+from django.utils.dateparse import parse_duration
+from shared.routers import read_from_primary
+from shared.versions import bump_version, get_version
+
+from .leaderboard import build_results
+from .models import FinalResults, StatusChoice
+from .roster import get_roster_version
+
+VERSION_KEY = "tournament:standings:{cross_id}:version"
+MODIFIED_KEY = "tournament:standings:{cross_id}:modified"
+RESULTS_KEY = "tournament:standings:{cross_id}:results:{version}"
+RESULTS_TIMEOUT = 60 * 60
+
+
+def get_standings_version(cross_id):
+    """Returns the current (version, last modified time) of the standings of a cross."""
+    version_key = VERSION_KEY.format(cross_id=cross_id)
+    modified_key = MODIFIED_KEY.format(cross_id=cross_id)
+    values = cache.get_many([version_key, modified_key])
+    if version_key in values and modified_key in values:
+        return values[version_key], values[modified_key]
+
+    version = get_version(version_key)
+    cache.add(modified_key, datetime.datetime.now(tz=datetime.timezone.utc), timeout=None)
+    return version, cache.get(modified_key)
+
+
+def get_results_version(cross_id):
+    """Returns the (version, last modified time) of the results of a cross, they change with its standings
+    and with the teams."""
+    version, modified = get_standings_version(cross_id)
+    roster_version, roster_modified = get_roster_version()
+    return f"{version}-{roster_version}", max(modified, roster_modified)
+
+
+def bump_standings_version(cross_id):
+    bump_version(VERSION_KEY.format(cross_id=cross_id))
+    cache.set(MODIFIED_KEY.format(cross_id=cross_id), datetime.datetime.now(tz=datetime.timezone.utc),
+              timeout=None)
+
+
+def bump_standings_version_on_commit(cross_id):
+    transaction.on_commit(lambda: bump_standings_version(cross_id))
+
+
+def freeze_results(db_cross):
+    """Stores the final results of a finished cross, they are served from then on instead of the standings."""
+    FinalResults.objects.update_or_create(cross=db_cross, defaults={"results": build_results(db_cross)})
+    bump_standings_version_on_commit(db_cross.id)
+
+
+def get_final_results(db_cross):
+    try:
+        results = FinalResults.objects.values_list("results", flat=True).get(cross=db_cross)
+    except FinalResults.DoesNotExist:
+        return None
+
+    for result in results:
+        result["penalty_time"] = parse_duration(result["penalty_time"])
+    return results
+
+
+def get_results(db_cross, version):
+    """Returns the results of a cross for the given results version, computing them only on a cache miss."""
+    key = RESULTS_KEY.format(cross_id=db_cross.id, version=version)
+    results = cache.get(key)
+    if results is None:
+        # The results are cached for every request of this version, a lagging replica must not fill them
+        with read_from_primary():
+            if db_cross.status == StatusChoice.FINISHED:
+                results = get_final_results(db_cross)
+            if results is None:
+                results = build_results(db_cross)
+        cache.set(key, results, timeout=RESULTS_TIMEOUT)
+    return results
@@ -0,0 +1,78 @@
+from django.db import transaction
+
+from .events import publish_standing_on_commit
+from .leaderboard import build_history_standings
+from .models import Standing, StatusChoice
+from .snapshots import bump_standings_version_on_commit, freeze_results
+
+BATCH_SIZE = 1000
+
+
+def _get_standing(team, db_task):
+    db_standing, _ = Standing.objects.select_for_update().get_or_create(
+        team=team, task=db_task, defaults={"cross": db_task.cross})
+    return db_standing
+
+
+def _save_standing(db_standing, team, db_task):
+    db_cross = db_task.cross
+    db_standing.penalty = db_cross.rules.penalty(db_cross.start_time, db_standing.solved_at,
+                                                 db_standing.hint_number, db_standing.wrong_answers)
+    db_standing.save()
+    bump_standings_version_on_commit(db_standing.cross_id)
+    publish_standing_on_commit(db_standing, team, db_task)
+
+
+def record_answer(db_answer):
+    """Applies a newly stored answer to the team's standing. Must run inside the answer's transaction."""
+    db_standing = _get_standing(db_answer.team, db_answer.task)
+    if db_answer.is_correct:
+        if not db_standing.solved:
+            db_standing.solved = True
+            db_standing.solved_at = db_answer.submitted_at
+            db_standing.solved_answer = db_answer
+            db_standing.solved_answer_text = db_answer.answer
+    else:
+        db_standing.wrong_answers += 1
+    _save_standing(db_standing, db_answer.team, db_answer.task)
+
+
+def record_hint(team, db_task, hint_number):
+    """Applies the number of opened hints to the team's standing. Must run inside the hint's transaction."""
+    db_standing = _get_standing(team, db_task)
+    if hint_number > db_standing.hint_number:
+        db_standing.hint_number = hint_number
+        _save_standing(db_standing, team, db_task)
+
+
+def _refreeze_results(db_cross):
+    if db_cross.status == StatusChoice.FINISHED:
+        freeze_results(db_cross)
+    else:
+        bump_standings_version_on_commit(db_cross.id)
+
+
+@transaction.atomic
+def rebuild_standings(db_cross):
+    Standing.objects.filter(cross=db_cross).delete()
+    Standing.objects.bulk_create(build_history_standings(db_cross))
+    _refreeze_results(db_cross)
+
+
+@transaction.atomic
+def rescore_standings(db_cross, batch_size=BATCH_SIZE):
+    """Recomputes the penalties of all standings of a cross under its current scoring rules."""
+    rules = db_cross.rules
+    db_standings = []
+    for db_standing in (Standing.objects
+                        .filter(cross=db_cross)
+                        .only('id', 'solved_at', 'hint_number', 'wrong_answers')
+                        .iterator(chunk_size=batch_size)):
+        db_standing.penalty = rules.penalty(db_cross.start_time, db_standing.solved_at,
+                                            db_standing.hint_number, db_standing.wrong_answers)
+        db_standings.append(db_standing)
+        if len(db_standings) == batch_size:
+            Standing.objects.bulk_update(db_standings, ['penalty'])
+            db_standings = []
+    Standing.objects.bulk_update(db_standings, ['penalty'])
+    _refreeze_results(db_cross)
@@ -0,0 +1,64 @@
+import asyncio
+import json
+
+from django.http import StreamingHttpResponse
+from rest_framework.utils.encoders import JSONEncoder
+
+from .authentication import async_api_view, error_response
+from .broker import get_broker
+from .events import standings_channel, team_channel
+from .models import Cross, StatusChoice
+
+KEEPALIVE_INTERVAL = 15
+# Connections are recycled so that clients gone without a disconnect event do not pile up,
+# EventSource reconnects by itself after RETRY_INTERVAL milliseconds
+STREAM_MAX_AGE = 5 * 60
+RETRY_INTERVAL = 3000
+
+
+def format_event(message):
+    data = json.dumps(message["data"], cls=JSONEncoder)
+    return f"event: {message['event']}\ndata: {data}\n\n"
+
+
+async def event_stream(channel, keepalive=KEEPALIVE_INTERVAL, max_age=STREAM_MAX_AGE):
+    subscription = await get_broker().subscribe(channel)
+    try:
+        yield f"retry: {RETRY_INTERVAL}\n\n"
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + max_age
+        while (remaining := deadline - loop.time()) > 0:
+            message = await subscription.get(timeout=min(keepalive, remaining))
+            if message is None:
+                yield ": keepalive\n\n"
+            else:
+                yield format_event(message)
+    finally:
+        await subscription.close()
+
+
+def stream_response(channel):
+    response = StreamingHttpResponse(event_stream(channel), content_type="text/event-stream")
+    response.headers["Cache-Control"] = "no-cache"
+    response.headers["X-Accel-Buffering"] = "no"
+    return response
+
+
+@async_api_view(methods=["GET"], admin=True)
+async def cross_stream(request, user, pk):
+    """Streams the standings changes of a cross to the results display."""
+    if not await Cross.objects.filter(pk=pk).aexists():
+        return error_response("Cross not found", 404)
+
+    return stream_response(standings_channel(pk))
+
+
+@async_api_view(methods=["GET"])
+async def task_stream(request, user):
+    """Streams the task status changes of the calling team in the current cross."""
+    try:
+        db_cross = await Cross.objects.aget(status=StatusChoice.STARTED)
+    except Cross.DoesNotExist:
+        return error_response("Cross not started", 405)
+
+    return stream_response(team_channel(db_cross.id, user.id))
@@ -4,13 +4,17 @@ from drf_spectacular.views import (SpectacularAPIView, SpectacularRedocView,
                                    SpectacularSwaggerView)
 from rest_framework_nested import routers
 
-from . import views
+from . import async_views, streams, views
 
 cross_router = routers.SimpleRouter()
 cross_router.register(r'crosses', views.CrossViewSet)
 cross_router.register(r'tasks', views.TaskViewSet)
 
 urlpatterns = [
+    path('crosses/<int:pk>/stream/', streams.cross_stream, name='cross-stream'),
+    path('tasks/stream/', streams.task_stream, name='task-stream'),
+    path('async/tasks/<int:pk>/submit/', async_views.submit, name='async-task-submit'),
+    path('async/tasks/<int:pk>/hints/<int:hint_number>/', async_views.hints, name='async-task-hints'),
     path('', include(cross_router.urls)),
     path('schema/', SpectacularAPIView.as_view(
         permission_classes=[]
@@ -1,16 +1,33 @@
 import datetime
 
 import pytz
+from django.db import IntegrityError, transaction
+from django.http import StreamingHttpResponse
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date, quote_etag
 from drf_spectacular.types import OpenApiTypes
 from drf_spectacular.utils import (OpenApiParameter, extend_schema,
                                    extend_schema_view)
 from rest_framework import status, viewsets
 from rest_framework.decorators import action
+from rest_framework.exceptions import ValidationError
+from rest_framework.generics import get_object_or_404
+from rest_framework.parsers import JSONParser
 from rest_framework.permissions import IsAdminUser, IsAuthenticated
 from rest_framework.response import Response
+from shared.parsers import NDJSONParser
 
-from .models import Answer, Cross, HintTaken, StatusChoice, Task, User
-from .serializers import AnswerSerializer, CrossSerializer
+from .active import get_active_cross, get_task
+from .board import build_task_board
+from .exports import CONTENT_TYPES, EXPORT_FORMATS, EXPORT_KINDS, export_cross
+from .finisher import finish_cross
+from .models import Cross, StatusChoice, Task
+from .pagination import CrossCursorPagination
+from .projections import CROSS_COLUMNS, CROSS_FIELDS, CROSS_HEADER_FIELDS, project_answer, project_crosses
+from .serializers import CrossImportSerializer, CrossScoringSerializer, CrossSerializer
+from .services import HintNotAvailable, check_cross_open, open_hint, submit_answer
+from .snapshots import get_results, get_results_version
+from .standings import rescore_standings
 
 
 @extend_schema(tags=["crosses"])
@@ -21,6 +38,13 @@ from .serializers import AnswerSerializer, CrossSerializer
     ),
     list=extend_schema(
         summary="Method returns a paginated list of crosses",
+        parameters=[
+            OpenApiParameter('fields', location=OpenApiParameter.QUERY, type=OpenApiTypes.STR,
+                             description="Comma-separated cross fields to return, "
+                                         f"{', '.join(CROSS_HEADER_FIELDS)} by default"),
+            OpenApiParameter('expand', location=OpenApiParameter.QUERY, type=OpenApiTypes.STR,
+                             enum=["tasks"], description="Include the tasks of every cross"),
+        ],
         responses={"200": CrossSerializer(many=True)},
     ),
     create=extend_schema(
@@ -36,6 +60,27 @@ class CrossViewSet(viewsets.ModelViewSet):
     serializer_class = CrossSerializer
     permission_classes = [IsAdminUser]
     http_method_names = ["get", "post", "delete"]
+    pagination_class = CrossCursorPagination
+
+    def get_list_fields(self):
+        fields = self.request.query_params.get("fields")
+        fields = fields.split(",") if fields else list(CROSS_HEADER_FIELDS)
+        unknown = [field for field in fields if field not in CROSS_FIELDS]
+        if unknown:
+            raise ValidationError({"fields": [f"Unknown fields: {', '.join(unknown)}"]})
+        if "tasks" in self.request.query_params.get("expand", "").split(","):
+            fields.append("tasks")
+        return fields
+
+    def list(self, request):
+        fields = self.get_list_fields()
+        rows = self.paginate_queryset(self.filter_queryset(self.get_queryset()).values(*CROSS_COLUMNS))
+        return self.get_paginated_response(project_crosses(rows, fields))
+
+    def retrieve(self, request, pk):
+        # DRF's get_object_or_404 also answers 404 to a pk that is not a number
+        row = get_object_or_404(self.get_queryset().values(*CROSS_COLUMNS), pk=pk)
+        return Response(data=project_crosses([row])[0], status=status.HTTP_200_OK)
 
     @extend_schema(
         methods=["POST"],
@@ -57,18 +102,104 @@ class CrossViewSet(viewsets.ModelViewSet):
             return Response(data={"detail": "Cross have already finished. You cannot start it again"},
                             status=status.HTTP_405_METHOD_NOT_ALLOWED)
 
-        if Cross.objects.filter(status=StatusChoice.STARTED):
+        if Cross.objects.filter(status=StatusChoice.STARTED).exists():
             return Response(data={"detail": "Some cross have already started"},
                             status=status.HTTP_405_METHOD_NOT_ALLOWED)
 
         start_time = datetime.datetime.now(tz=pytz.utc)
         db_cross.start_time = start_time
-        db_cross.end_time = start_time + datetime.timedelta(minutes=20)
+        db_cross.end_time = start_time + db_cross.duration
         db_cross.status = StatusChoice.STARTED
-        db_cross.save()
+        try:
+            with transaction.atomic():
+                db_cross.save()
+        except IntegrityError:
+            # Another cross has been started concurrently
+            return Response(data={"detail": "Some cross have already started"},
+                            status=status.HTTP_405_METHOD_NOT_ALLOWED)
+
+        return Response(data=CrossSerializer(db_cross).data, status=status.HTTP_200_OK)
+
+    @extend_schema(
+        methods=["POST"],
+        operation_id="crosses_rescore",
+        summary="Method changes the penalties of a cross and recomputes its standings",
+        request=CrossScoringSerializer,
+        responses={"200": CrossSerializer},
+    )
+    @action(detail=True,
+        methods=["POST"],
+        url_path='rescore',
+    )
+    def rescore(self, request, pk):
+        try:
+            db_cross = Cross.objects.get(pk=pk)
+        except Cross.DoesNotExist:
+            return Response(data={"detail": "Cross not found"}, status=status.HTTP_404_NOT_FOUND)
+
+        if db_cross.status == StatusChoice.STARTED:
+            return Response(data={"detail": "Cross is in progress. You cannot change its scoring"},
+                            status=status.HTTP_405_METHOD_NOT_ALLOWED)
+
+        serializer = CrossScoringSerializer(db_cross, data=request.data, partial=True)
+        serializer.is_valid(raise_exception=True)
+        with transaction.atomic():
+            db_cross = serializer.save()
+            rescore_standings(db_cross)
 
         return Response(data=CrossSerializer(db_cross).data, status=status.HTTP_200_OK)
 
+    @extend_schema(
+        methods=["POST"],
+        operation_id="crosses_import",
+        summary="Method creates many crosses at once",
+        request=CrossSerializer(many=True),
+        responses={"201": CrossImportSerializer},
+    )
+    @action(detail=False,
+        methods=["POST"],
+        url_path='import',
+        parser_classes=[JSONParser, NDJSONParser],
+    )
+    def import_crosses(self, request):
+        if not isinstance(request.data, list):
+            return Response(data={"detail": "Expected a list of crosses"}, status=status.HTTP_400_BAD_REQUEST)
+
+        serializer = CrossSerializer(data=request.data, many=True)
+        serializer.is_valid(raise_exception=True)
+        db_crosses = serializer.save()
+
+        return Response(data=CrossImportSerializer({
+            "crosses": [db_cross.id for db_cross in db_crosses],
+            "tasks": sum(len(cross["tasks"]) for cross in serializer.validated_data),
+        }).data, status=status.HTTP_201_CREATED)
+
+    @extend_schema(
+        methods=["GET"],
+        operation_id="crosses_export",
+        summary="Stream the answers or the standings of a cross as CSV or NDJSON",
+        parameters=[
+            OpenApiParameter('kind', location=OpenApiParameter.PATH, type=OpenApiTypes.STR, enum=EXPORT_KINDS),
+            OpenApiParameter('export_format', location=OpenApiParameter.PATH, type=OpenApiTypes.STR,
+                             enum=EXPORT_FORMATS),
+        ],
+        responses={(200, content_type): OpenApiTypes.STR for content_type in CONTENT_TYPES.values()},
+    )
+    @action(detail=True,
+        methods=["GET"],
+        url_path=r"export/(?P<kind>answers|standings)\.(?P<export_format>csv|ndjson)",
+    )
+    def export(self, request, pk, kind, export_format):
+        try:
+            db_cross = Cross.objects.get(pk=pk)
+        except Cross.DoesNotExist:
+            return Response(data={"detail": "Cross not found"}, status=status.HTTP_404_NOT_FOUND)
+
+        response = StreamingHttpResponse(export_cross(db_cross, kind, export_format),
+                                         content_type=CONTENT_TYPES[export_format])
+        response.headers["Content-Disposition"] = f'attachment; filename="cross-{db_cross.id}-{kind}.{export_format}"'
+        return response
+
     @extend_schema(
         methods=["GET"],
         summary="Get results of all teams",
@@ -85,52 +216,21 @@ class CrossViewSet(viewsets.ModelViewSet):
             return Response(data={"detail": "Cross not started"}, status=status.HTTP_405_METHOD_NOT_ALLOWED)
 
         if db_cross.status == StatusChoice.STARTED and datetime.datetime.now(tz=pytz.utc) > db_cross.end_time:
-            db_cross.status = StatusChoice.FINISHED
-            db_cross.save()
-
-        results = []
-        db_users = User.objects.filter(groups__name='user')
-        db_tasks = Task.objects.filter(cross=db_cross)
-        for db_user in db_users:
-            tasks = []
-            completed_tasks = 0
-            penalty_time = datetime.timedelta()
-            for db_task in db_tasks:
-                try:
-                    db_answer = Answer.objects.get(task=db_task, team=db_user, is_correct=True)
-                    task_status = True
+            # The finish_crosses worker is late or not running
+            finish_cross(db_cross)
 
-                    completed_tasks += 1
+        version, last_modified = get_results_version(db_cross.id)
+        etag = quote_etag(f"{db_cross.id}-{version}")
+        not_modified = get_conditional_response(request, etag=etag, last_modified=int(last_modified.timestamp()))
+        if not_modified is not None:
+            return not_modified
 
-                    penalty_time += (db_answer.submitted_at - db_task.cross.start_time)
+        results = get_results(db_cross, version)
 
-                    try:
-                        db_hint_taken = HintTaken.objects.get(team=request.user, task=db_task)
-                        hint_number = db_hint_taken.hint_number
-                    except HintTaken.DoesNotExist:
-                        hint_number = 0
-
-                    penalty_time += (datetime.timedelta(minutes=15) * hint_number)
-
-                    wrong_answers = Answer.objects.filter(team=db_user, task=db_task, is_correct=False).count()
-                    penalty_time += (datetime.timedelta(minutes=30) * wrong_answers)
-
-                except Answer.DoesNotExist:
-                    task_status = False
-
-                tasks.append({
-                    "name": db_task.name,
-                    "status": task_status
-                })
-
-            results.append({
-                "team": db_user.username,
-                "completed_tasks": completed_tasks,
-                "penalty_time": penalty_time,
-                "tasks": tasks
-            })
-
-        return Response(data=results, status=status.HTTP_200_OK)
+        response = Response(data=results, status=status.HTTP_200_OK)
+        response.headers["ETag"] = etag
+        response.headers["Last-Modified"] = http_date(last_modified.timestamp())
+        return response
 
 
 @extend_schema(tags=["tasks"])
@@ -156,46 +256,11 @@ class TaskViewSet(viewsets.GenericViewSet):
         summary="Method returns a list of all tasks of current cross",
     )
     def list(self, request):
-        try:
-            db_cross = Cross.objects.get(status=StatusChoice.STARTED)
-        except Cross.DoesNotExist:
+        db_cross = get_active_cross().cross
+        if db_cross is None:
             return Response(data={"detail": "Cross not started"}, status=status.HTTP_405_METHOD_NOT_ALLOWED)
 
-        db_tasks = Task.objects.filter(cross=db_cross)
-
-        tasks = []
-        for db_task in db_tasks:
-            try:
-                db_hint_taken = HintTaken.objects.get(team=request.user, task=db_task)
-                hint_number = db_hint_taken.hint_number
-            except HintTaken.DoesNotExist:
-                hint_number = 0
-
-            hints = []
-            if hint_number > 0:
-                hints.append(db_task.hint1)
-            if hint_number > 1:
-                hints.append(db_task.hint2)
-            if hint_number > 2:
-                hints.append(db_task.hint3)
-
-            answer_status = "not started"
-            db_answers = Answer.objects.filter(task=db_task, team=request.user)
-            if db_answers.exists():
-                try:
-                    db_answers.get(is_correct=True)
-                    answer_status = "correct"
-                except Answer.DoesNotExist:
-                    answer_status = "wrong"
-
-            tasks.append({
-                "id": db_task.id,
-                "name": db_task.name,
-                "coordinates": db_task.coordinates,
-                "description": db_task.description,
-                "hints": hints,
-                "status": answer_status
-            })
+        tasks = build_task_board(db_cross, request.user)
 
         return Response(data=tasks, status=status.HTTP_200_OK)
 
@@ -214,26 +279,22 @@ class TaskViewSet(viewsets.GenericViewSet):
     )
     def submit(self, request, pk):
         answer = request.query_params.get("answer")
+        if not answer or not answer.strip():
+            return Response(data={"detail": "Answer is required"}, status=status.HTTP_400_BAD_REQUEST)
+
         try:
-            db_task = Task.objects.get(pk=pk)
+            db_task = get_task(pk)
         except Task.DoesNotExist:
             return Response(data={"detail": "Task not found"}, status=status.HTTP_404_NOT_FOUND)
 
-        if db_task.cross.status != StatusChoice.STARTED:
-            return Response(data={"detail": "Cross not started"}, status=status.HTTP_405_METHOD_NOT_ALLOWED)
-
-        if datetime.datetime.now(tz=pytz.utc) > db_task.cross.end_time:
-            return Response(data={"detail": "Cross finished"}, status=status.HTTP_400_BAD_REQUEST)
+        error = check_cross_open(db_task.cross, for_answers=True)
+        if error:
+            detail, error_status = error
+            return Response(data={"detail": detail}, status=error_status)
 
-        try:
-            db_answer = Answer.objects.get(task=db_task, team=request.user, answer=answer)
-        except Answer.DoesNotExist:
-            is_correct = False
-            if answer == db_task.correct_answer:
-                is_correct = True
-            db_answer = Answer.objects.create(team=request.user, task=db_task, answer=answer, is_correct=is_correct)
+        db_answer = submit_answer(request.user, db_task, answer)
 
-        return Response(data=AnswerSerializer(db_answer).data, status=status.HTTP_200_OK)
+        return Response(data=project_answer(db_answer), status=status.HTTP_200_OK)
 
     @extend_schema(
         methods=["POST"],
@@ -255,37 +316,18 @@ class TaskViewSet(viewsets.GenericViewSet):
                             status=status.HTTP_400_BAD_REQUEST)
 
         try:
-            db_task = Task.objects.get(pk=pk)
+            db_task = get_task(pk)
         except Task.DoesNotExist:
             return Response(data={"detail": "Task not found"}, status=status.HTTP_404_NOT_FOUND)
 
-        if db_task.cross.status != StatusChoice.STARTED:
-            return Response(data={"detail": "Cross not started"}, status=status.HTTP_405_METHOD_NOT_ALLOWED)
+        error = check_cross_open(db_task.cross)
+        if error:
+            detail, error_status = error
+            return Response(data={"detail": detail}, status=error_status)
 
         try:
-            db_hint_taken = HintTaken.objects.get(team=request.user, task=db_task)
-        except HintTaken.DoesNotExist:
-            db_hint_taken = HintTaken.objects.create(hint_number=0, team=request.user, task=db_task)
-
-        if hint_number > db_hint_taken.hint_number:
-            return Response(data={"detail": f"Firstly you should open the {db_hint_taken.hint_number} hint"},
-                            status=status.HTTP_405_METHOD_NOT_ALLOWED)
-        hint = ""
-        if hint_number == 0:
-            if db_hint_taken.hint_number < 1:
-                db_hint_taken.hint_number = 1
-            hint = db_task.hint1
-
-        elif hint_number == 1:
-            if db_hint_taken.hint_number < 2:
-                db_hint_taken.hint_number = 2
-            hint = db_task.hint2
-
-        elif hint_number == 2:
-            if db_hint_taken.hint_number < 3:
-                db_hint_taken.hint_number = 3
-            hint = db_task.hint3
-
-        db_hint_taken.save()
+            hint = open_hint(request.user, db_task, hint_number)
+        except HintNotAvailable as e:
+            return Response(data={"detail": str(e)}, status=status.HTTP_405_METHOD_NOT_ALLOWED)
 
         return Response(data={"hint": hint}, status=status.HTTP_200_OK)
@@ -0,0 +1,84 @@
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
+from django.db.models import prefetch_related_objects
+from rest_framework.authentication import TokenAuthentication
+
+from .versions import bump_version, get_version
+
+USER_VERSION_KEY = "{prefix}:user:{user_id}:version"
+
+
+class LRUCache:
+    """Thread-safe mapping that keeps at most max_size entries, each for ttl seconds."""
+
+    def __init__(self, max_size, ttl, clock=time.monotonic):
+        self.max_size = max_size
+        self.ttl = ttl
+        self.clock = clock
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            value, expires_at = entry
+            if expires_at <= self.clock():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key, value):
+        with self._lock:
+            self._entries[key] = (value, self.clock() + self.ttl)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+_tokens = LRUCache(getattr(settings, "TOKEN_CACHE_SIZE", 10000), getattr(settings, "TOKEN_CACHE_TTL", 60))
+
+
+def _user_version_key(user_id):
+    # Prefixed per project, the projects may share a cache but not their user ids
+    return USER_VERSION_KEY.format(prefix=getattr(settings, "TOKEN_CACHE_KEY_PREFIX", "auth"), user_id=user_id)
+
+
+def invalidate_user_tokens(user_id):
+    """Drops the cached tokens of the user in all processes."""
+    bump_version(_user_version_key(user_id))
+
+
+class CachedTokenAuthentication(TokenAuthentication):
+    """TokenAuthentication that keeps recently used tokens and their users, with groups, in a process-local LRU.
+
+    A cached token is only used while the version of its user is unchanged, see invalidate_user_tokens.
+    """
+
+    def authenticate_credentials(self, key):
+        cached = _tokens.get(key)
+        if cached is not None:
+            user, token, version = cached
+            if version == get_version(_user_version_key(user.id)):
+                return user, token
+            user_id = user.id
+        else:
+            user_id = self.get_model().objects.filter(key=key).values_list("user_id", flat=True).first()
+
+        # Read before the user is loaded: an invalidation in between then outdates the entry instead of
+        # caching the user it invalidated under the new version
+        version = get_version(_user_version_key(user_id)) if user_id is not None else None
+        user, token = super().authenticate_credentials(key)
+        prefetch_related_objects([user], "groups")
+        if version is not None:
+            _tokens.set(key, (user, token, version))
+        return user, token
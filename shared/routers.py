@@ -0,0 +1,78 @@
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, connections
+from django.utils.decorators import sync_and_async_middleware
+
+REPLICA_DB_ALIAS = 'replica'
+STICKY_COOKIE = 'primary_until'
+SAFE_METHODS = ('GET', 'HEAD', 'OPTIONS')
+
+_read_only = ContextVar('read_only', default=False)
+
+
+@contextmanager
+def read_from_primary():
+    """Sends the reads inside the block to the primary, e.g. to fill caches shared by all requests."""
+    token = _read_only.set(False)
+    try:
+        yield
+    finally:
+        _read_only.reset(token)
+
+
+class ReplicaRouter:
+    """Sends the reads of read-only requests to the replica and everything else to the primary."""
+
+    def db_for_read(self, model, **hints):
+        if (_read_only.get() and REPLICA_DB_ALIAS in settings.DATABASES
+                and not connections[DEFAULT_DB_ALIAS].in_atomic_block):
+            return REPLICA_DB_ALIAS
+        return DEFAULT_DB_ALIAS
+
+    def db_for_write(self, model, **hints):
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        return True
+
+
+@sync_and_async_middleware
+class ReplicaRoutingMiddleware:
+    """Marks safe requests as read-only, unless the client has written within REPLICA_STICKY_SECONDS."""
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+
+        token = _read_only.set(self._is_read_only(request))
+        try:
+            response = self.get_response(request)
+        finally:
+            _read_only.reset(token)
+        return self._stick_to_primary(request, response)
+
+    async def __acall__(self, request):
+        token = _read_only.set(self._is_read_only(request))
+        try:
+            response = await self.get_response(request)
+        finally:
+            _read_only.reset(token)
+        return self._stick_to_primary(request, response)
+
+    def _is_read_only(self, request):
+        return request.method in SAFE_METHODS and STICKY_COOKIE not in request.COOKIES
+
+    def _stick_to_primary(self, request, response):
+        if request.method not in SAFE_METHODS and response.status_code < 400:
+            # The replica may lag behind, the following reads of this client see its writes on the primary
+            response.set_cookie(STICKY_COOKIE, '1', max_age=settings.REPLICA_STICKY_SECONDS,
+                                httponly=True, samesite='Lax')
+        return response
@@ -0,0 +1,31 @@
+import time
+
+from django.core.cache import cache
+
+
+def _initial_version():
+    # Seeded from the clock so that a version evicted from the cache never goes backwards
+    return time.time_ns() // 1000
+
+
+def get_version(key):
+    version = cache.get(key)
+    if version is None:
+        cache.add(key, _initial_version(), timeout=None)
+        version = cache.get(key)
+    return version
+
+
+async def aget_version(key):
+    version = await cache.aget(key)
+    if version is None:
+        await cache.aadd(key, _initial_version(), timeout=None)
+        version = await cache.aget(key)
+    return version
+
+
+def bump_version(key):
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.add(key, _initial_version(), timeout=None)
@@ -0,0 +1,52 @@
+"""Reports the time to create users one POST at a time and with one bulk request,
+whose passwords are hashed in the process pool.
+
+    python benchmarks/bench_bulk.py --users 200
+"""
+import argparse
+import os
+
+from common import create_database, destroy_database, report_throughput, timed
+from django.contrib.auth.models import User
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+
+def rows(prefix, count):
+    return [{'username': f'{prefix}{i}', 'password': f'password{i}', 'email': f'{prefix}{i}@example.com'}
+            for i in range(count)]
+
+
+def create_one_by_one(client, prefix, count):
+    for row in rows(prefix, count):
+        response = client.post(reverse('user-list'), row, format='json')
+        assert response.status_code == 201, response.content
+
+
+def create_in_bulk(client, prefix, count):
+    response = client.post(reverse('user-bulk-create'), rows(prefix, count), format='json')
+    assert response.status_code == 201, response.content
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--users', type=int, default=200)
+    args = parser.parse_args()
+
+    old_name = create_database()
+    try:
+        client = APIClient()
+        client.force_authenticate(user=User.objects.create(username='admin'))
+        # Starts the pool outside of the measurement
+        create_in_bulk(client, 'warmup', 16)
+
+        _, seconds = timed(create_one_by_one, client, 'single', args.users)
+        report_throughput('one POST per user', args.users, seconds)
+        _, seconds = timed(create_in_bulk, client, 'bulk', args.users)
+        report_throughput(f'bulk, {os.cpu_count()} cores', args.users, seconds)
+    finally:
+        destroy_database(old_name)
+
+
+if __name__ == '__main__':
+    main()
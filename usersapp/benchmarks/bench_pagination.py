@@ -0,0 +1,87 @@
+"""Reports the latency of deep pages of the user list with the keyset cursor and with
+limit/offset pagination, for every allowed ordering.
+
+    python benchmarks/bench_pagination.py --users 1000000 --requests 50
+"""
+import argparse
+import random
+import time
+
+from common import create_database, destroy_database, report_latency
+from django.contrib.auth.models import User
+from django.urls import reverse
+from rest_framework.pagination import LimitOffsetPagination
+from rest_framework.test import APIClient
+
+from users.pagination import KeysetCursorPagination
+from users.views import UserViewSet
+
+ORDERINGS = ('id', 'username', 'email', 'first_name', '-last_name')
+BATCH_SIZE = 10000
+
+
+def create_users(count):
+    # Few distinct names, so the name orderings have long runs of equal values
+    rng = random.Random(count)
+    for start in range(0, count, BATCH_SIZE):
+        User.objects.bulk_create([
+            User(username=f'user{i:07}', email=f'user{rng.randrange(count)}@example.com',
+                 first_name=f'first{rng.randrange(100)}', last_name=f'last{rng.randrange(1000)}')
+            for i in range(start, min(start + BATCH_SIZE, count))
+        ])
+
+
+def measure(client, urls):
+    samples = []
+    for url in urls:
+        start = time.perf_counter()
+        response = client.get(url)
+        samples.append(time.perf_counter() - start)
+        assert response.status_code == 200, response.content
+    return samples
+
+
+def run(client, ordering, depths, page_size):
+    url = reverse('user-list') + f'?ordering={ordering}&page_size={page_size}'
+    tie_breaker = '-id' if ordering.startswith('-') else 'id'
+    fields = [field.lstrip('-') for field in (ordering, tie_breaker)]
+    paginator = KeysetCursorPagination()
+    paginator.base_url = url
+    cursors = []
+    for depth in depths:
+        position = list(User.objects.order_by(ordering, tie_breaker).values_list(*fields)[depth])
+        if ordering.lstrip('-') in ('id', 'username'):
+            position = position[:1]
+        cursors.append(paginator.encode_cursor((False, position)))
+
+    UserViewSet.pagination_class = KeysetCursorPagination
+    report_latency(f'{ordering} keyset', measure(client, cursors))
+    UserViewSet.pagination_class = LimitOffsetPagination
+    report_latency(f'{ordering} offset', measure(client, [f'{url}&limit={page_size}&offset={depth}'
+                                                          for depth in depths]))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--users', type=int, default=1000000)
+    parser.add_argument('--requests', type=int, default=50)
+    parser.add_argument('--page-size', type=int, default=50)
+    args = parser.parse_args()
+
+    old_name = create_database()
+    try:
+        create_users(args.users)
+        client = APIClient()
+        client.force_authenticate(user=User.objects.first())
+        rng = random.Random(args.requests)
+        # Pages from the last tenth of the list
+        depths = [rng.randrange(args.users * 9 // 10, args.users - args.page_size) for _ in range(args.requests)]
+        for ordering in ORDERINGS:
+            run(client, ordering, depths, args.page_size)
+    finally:
+        UserViewSet.pagination_class = KeysetCursorPagination
+        destroy_database(old_name)
+
+
+if __name__ == '__main__':
+    main()
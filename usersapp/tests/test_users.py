@@ -1,9 +1,17 @@
+import json
+from base64 import b64encode
+
 import pytest
 from django.contrib.auth.models import User
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 from rest_framework import status
+from rest_framework.authtoken.models import Token
 from rest_framework.test import APIClient
 
+from users import hashing
+
 
 @pytest.fixture
 def authenticated_client():
@@ -58,7 +66,7 @@ def test_get_multiple_users(authenticated_client):
 
     assert response.status_code == status.HTTP_200_OK
 
-    usernames = [user['username'] for user in response.data]
+    usernames = [user['username'] for user in response.data['results']]
     assert 'user1' in usernames
     assert 'user2' in usernames
     assert 'user3' in usernames
@@ -76,7 +84,7 @@ def test_sort_users(authenticated_client):
 
     assert response.status_code == status.HTTP_200_OK
 
-    usernames = [user['username'] for user in response.data]
+    usernames = [user['username'] for user in response.data['results']]
     assert usernames == ['a', 'b', 'c', 'testuser']
 
 
@@ -92,8 +100,97 @@ def test_filter_users(authenticated_client):
 
     assert response.status_code == status.HTTP_200_OK
 
-    assert len(response.data) == 1
-    assert response.data[0]['username'] == 'user2'
+    assert len(response.data['results']) == 1
+    assert response.data['results'][0]['username'] == 'user2'
+
+
+@pytest.mark.django_db
+def test_filter_users_by_prefix(authenticated_client):
+    client = authenticated_client
+
+    User.objects.create_user(username='user1', password='testpassword1', email='Anna.Smith@example.com')
+    User.objects.create_user(username='user2', password='testpassword2', email='anton@example.com')
+    User.objects.create_user(username='user3', password='testpassword3', email='bob@example.com')
+
+    response = client.get(reverse('user-list') + '?email__istartswith=ANN')
+
+    assert response.status_code == status.HTTP_200_OK
+    assert [user['username'] for user in response.data['results']] == ['user1']
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize('search, expected', [
+    ('smi', ['user1', 'user3']),
+    ('ith ann', ['user1']),
+    ('example.org', ['user2']),
+    ('a', ['user1', 'user2']),
+    ('Doe', []),
+])
+def test_search_users(authenticated_client, search, expected):
+    client = authenticated_client
+
+    User.objects.create_user(username='user1', password='testpassword1', email='anna@example.com',
+                             first_name='Anna', last_name='Smith')
+    User.objects.create_user(username='user2', password='testpassword2', email='anton@example.org',
+                             first_name='Anton', last_name='Doe')
+    user = User.objects.create_user(username='user3', password='testpassword3', email='bob@example.com',
+                                    first_name='Bob')
+    user.last_name = 'Goldsmith'
+    user.save()
+    User.objects.filter(username='user2').update(last_name='Brown')
+
+    response = client.get(reverse('user-list'), {'search': search})
+
+    assert response.status_code == status.HTTP_200_OK
+    assert [user['username'] for user in response.data['results']] == expected
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize('ordering', ['first_name', '-first_name', 'username', '-id'])
+def test_paginate_users(authenticated_client, ordering):
+    client = authenticated_client
+
+    User.objects.bulk_create([User(username=f'user{i}', first_name=f'name{i % 3}') for i in range(10)])
+    tie_breaker = '-id' if ordering.startswith('-') else 'id'
+    expected = list(User.objects.order_by(ordering, tie_breaker).values_list('username', flat=True))
+
+    usernames = []
+    url = reverse('user-list') + f'?ordering={ordering}&page_size=3'
+    while url is not None:
+        response = client.get(url)
+        assert response.status_code == status.HTTP_200_OK
+        usernames.extend(user['username'] for user in response.data['results'])
+        previous, url = response.data['previous'], response.data['next']
+    assert usernames == expected
+
+    response = client.get(previous)
+    assert [user['username'] for user in response.data['results']] == expected[-5:-2]
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize('cursor', [{'r': 0, 'p': ['abc']}, {'r': 0, 'p': [{'a': 1}]}, {'r': 0, 'p': [None]}, {'p': [1]}])
+def test_paginate_users_rejects_invalid_cursor(authenticated_client, cursor):
+    encoded = b64encode(json.dumps(cursor).encode()).decode()
+    response = authenticated_client.get(reverse('user-list'), {'cursor': encoded})
+
+    assert response.status_code == status.HTTP_404_NOT_FOUND
+    assert response.data['detail'] == 'Invalid cursor'
+
+
+@pytest.mark.django_db
+def test_paginate_users_rejects_several_ordering_fields(authenticated_client):
+    response = authenticated_client.get(reverse('user-list') + '?ordering=first_name,last_name')
+
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+    assert 'ordering' in response.data
+
+
+@pytest.mark.django_db
+def test_paginate_users_rejects_unindexed_ordering(authenticated_client):
+    response = authenticated_client.get(reverse('user-list') + '?ordering=date_joined')
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response.data['results'][0]['username'] == 'testuser'
 
 
 @pytest.mark.django_db
@@ -115,3 +212,109 @@ def test_update_user(authenticated_client):
     user.refresh_from_db()
     assert user.username == updated_data['username']
     assert user.email == updated_data['email']
+
+
+@pytest.mark.django_db
+def test_bulk_create_users(authenticated_client):
+    client = authenticated_client
+
+    rows = [{'username': f'team{i}', 'password': f'password{i}', 'email': f'team{i}@example.com'} for i in range(3)]
+    response = client.generic('POST', reverse('user-bulk-create'), '\n'.join(map(json.dumps, rows)),
+                              content_type='application/x-ndjson')
+
+    assert response.status_code == status.HTTP_201_CREATED
+    assert [user['username'] for user in response.data] == ['team0', 'team1', 'team2']
+    assert User.objects.get(id=response.data[1]['id']).check_password('password1')
+
+
+@pytest.mark.django_db
+def test_bulk_create_users_reports_row_errors(authenticated_client):
+    client = authenticated_client
+
+    response = client.post(reverse('user-bulk-create'), [{'username': 'team0'}, {'username': 'testuser'}],
+                           format='json')
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+    assert response.data[0] == {}
+    assert 'username' in response.data[1]
+
+    response = client.post(reverse('user-bulk-create'), [{'username': 'team0'}, {'username': 'team0'}],
+                           format='json')
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+    assert response.data[0] == {}
+    assert 'username' in response.data[1]
+    assert not User.objects.filter(username='team0').exists()
+
+
+@pytest.mark.django_db
+def test_bulk_create_users_checks_usernames_at_once(authenticated_client):
+    rows = [{'username': f'team{i}'} for i in range(20)]
+    with CaptureQueriesContext(connection) as context:
+        response = authenticated_client.post(reverse('user-bulk-create'), rows, format='json')
+
+    assert response.status_code == status.HTTP_201_CREATED
+    assert len([query for query in context.captured_queries if '"auth_user"."username"' in query['sql']
+                and query['sql'].startswith('SELECT')]) == 1
+
+
+@pytest.mark.django_db
+def test_bulk_update_users(authenticated_client):
+    client = authenticated_client
+
+    first = User.objects.create_user(username='team0', password='password0')
+    second = User.objects.create_user(username='team1', password='password1')
+
+    rows = [{'id': first.id, 'username': 'team0', 'email': 'team0@example.com'},
+            {'id': second.id, 'password': 'changed'}]
+    response = client.patch(reverse('user-bulk-create'), rows, format='json')
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response.data[0]['email'] == 'team0@example.com'
+    second.refresh_from_db()
+    assert second.check_password('changed')
+
+    response = client.patch(reverse('user-bulk-create'), [{'id': first.id}, {'id': 0}], format='json')
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+    assert response.data == [{}, {'id': ['User not found']}]
+
+
+@pytest.mark.django_db
+def test_bulk_delete_users(authenticated_client):
+    client = authenticated_client
+
+    user = User.objects.create_user(username='team0', password='password0')
+    response = client.delete(reverse('user-bulk-create'), [user.id, 0], format='json')
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response.data == [{'id': user.id, 'deleted': True}, {'id': 0, 'deleted': False}]
+    assert not User.objects.filter(id=user.id).exists()
+
+
+def test_hash_passwords_in_process_pool(monkeypatch):
+    monkeypatch.setattr(hashing, 'POOL_MIN_PASSWORDS', 0)
+
+    passwords = ['first', None, 'second']
+    hashes = hashing.hash_passwords(passwords)
+
+    user = User(password=hashes[0])
+    assert user.check_password('first')
+    user.password = hashes[1]
+    assert not user.has_usable_password()
+    user.password = hashes[2]
+    assert user.check_password('second')
+
+
+@pytest.mark.django_db
+def test_token_lookup_is_cached_until_logout():
+    user = User.objects.create_user(username='tokenuser', password='testpassword')
+    client = APIClient()
+    client.credentials(HTTP_AUTHORIZATION=f'Token {Token.objects.create(user=user).key}')
+    client.get(reverse('user-list'))
+
+    with CaptureQueriesContext(connection) as context:
+        response = client.get(reverse('user-list'))
+    assert response.status_code == status.HTTP_200_OK
+    assert not any('authtoken_token' in query['sql'] for query in context.captured_queries)
+
+    assert client.post('/auth/logout/').status_code == status.HTTP_200_OK
+    assert client.get(reverse('user-list')).status_code == status.HTTP_403_FORBIDDEN
+
@@ -1,8 +1,26 @@
 import django_filters
 from django.contrib.auth.models import User
+from django_filters.constants import EMPTY_VALUES
+
+from .search import filter_prefix, search_users
+
+
+class PrefixFilter(django_filters.CharFilter):
+    """Case-insensitive prefix match that can use the lower(field) indexes, unlike the istartswith lookup."""
+
+    def filter(self, qs, value):
+        if value in EMPTY_VALUES:
+            return qs
+        return filter_prefix(qs, self.field_name, value)
 
 
 class UserFilter(django_filters.FilterSet):
+    username__istartswith = PrefixFilter(field_name='username')
+    email__istartswith = PrefixFilter(field_name='email')
+    first_name__istartswith = PrefixFilter(field_name='first_name')
+    last_name__istartswith = PrefixFilter(field_name='last_name')
+    search = django_filters.CharFilter(method='filter_search')
+
     class Meta:
         model = User
         fields = {
@@ -10,4 +28,7 @@ class UserFilter(django_filters.FilterSet):
             'email': ['exact'],
             'first_name': ['exact'],
             'last_name': ['exact'],
-        }
\ No newline at end of file
+        }
+
+    def filter_search(self, queryset, name, value):
+        return search_users(queryset, value)
@@ -0,0 +1,35 @@
+import multiprocessing
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+
+from django.conf import settings
+from django.contrib.auth.hashers import get_hasher, make_password
+
+# Smaller batches are hashed in the calling process, sending them to the pool costs more than it saves
+POOL_MIN_PASSWORDS = 8
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def _get_executor():
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            # Spawned, not forked: forking a threaded server process can copy locks held by other threads
+            _executor = ProcessPoolExecutor(max_workers=getattr(settings, 'PASSWORD_HASH_WORKERS', None),
+                                            mp_context=multiprocessing.get_context('spawn'))
+        return _executor
+
+
+def hash_passwords(passwords):
+    """Returns the hashes of the passwords in order, computed on all cores for large batches.
+
+    A None password gets an unusable hash, like User.set_password(None).
+    """
+    # The hasher is resolved here so the workers need no Django settings
+    hash_password = partial(make_password, hasher=get_hasher())
+    if len(passwords) < POOL_MIN_PASSWORDS:
+        return [hash_password(password) for password in passwords]
+    return list(_get_executor().map(hash_password, passwords, chunksize=max(1, len(passwords) // 64)))
@@ -0,0 +1,20 @@
+from django.db import migrations
+
+# The users app has no models of its own, these index the auth_user columns the user list
+# can be ordered and filtered by. The primary key is the tie breaker of the keyset cursor.
+INDEXED_COLUMNS = ('email', 'first_name', 'last_name')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('auth', '0012_alter_user_first_name_max_length'),
+    ]
+
+    operations = [
+        migrations.RunSQL(
+            sql=f'CREATE INDEX users_auth_user_{column}_id_idx ON auth_user ({column}, id);',
+            reverse_sql=f'DROP INDEX users_auth_user_{column}_id_idx;',
+        )
+        for column in INDEXED_COLUMNS
+    ]
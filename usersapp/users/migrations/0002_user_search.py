@@ -0,0 +1,60 @@
+from django.db import migrations
+
+from users.search import SEARCH_FIELDS, SQLITE_SEARCH_TABLE
+
+POSTGRESQL_SQL = [
+    'CREATE EXTENSION IF NOT EXISTS pg_trgm;',
+    *(f'CREATE INDEX users_auth_user_{field}_lower_idx ON auth_user (lower({field}) text_pattern_ops);'
+      for field in SEARCH_FIELDS),
+    *(f'CREATE INDEX users_auth_user_{field}_trgm_idx ON auth_user USING gin (lower({field}) gin_trgm_ops);'
+      for field in SEARCH_FIELDS),
+]
+POSTGRESQL_REVERSE_SQL = [
+    *(f'DROP INDEX users_auth_user_{field}_lower_idx;' for field in SEARCH_FIELDS),
+    *(f'DROP INDEX users_auth_user_{field}_trgm_idx;' for field in SEARCH_FIELDS),
+]
+
+# An external content FTS5 table over auth_user, kept in sync by triggers
+COLUMNS = ', '.join(SEARCH_FIELDS)
+NEW_VALUES = ', '.join(f'new.{field}' for field in SEARCH_FIELDS)
+OLD_VALUES = ', '.join(f'old.{field}' for field in SEARCH_FIELDS)
+DELETE_OLD = (f"INSERT INTO {SQLITE_SEARCH_TABLE}({SQLITE_SEARCH_TABLE}, rowid, {COLUMNS}) "
+              f"VALUES ('delete', old.id, {OLD_VALUES});")
+INSERT_NEW = f'INSERT INTO {SQLITE_SEARCH_TABLE}(rowid, {COLUMNS}) VALUES (new.id, {NEW_VALUES});'
+SQLITE_SQL = [
+    *(f'CREATE INDEX users_auth_user_{field}_lower_idx ON auth_user (lower({field}));' for field in SEARCH_FIELDS),
+    f"CREATE VIRTUAL TABLE {SQLITE_SEARCH_TABLE} USING fts5({COLUMNS}, content='auth_user', content_rowid='id', "
+    f"tokenize='trigram');",
+    f'CREATE TRIGGER {SQLITE_SEARCH_TABLE}_insert AFTER INSERT ON auth_user BEGIN {INSERT_NEW} END;',
+    f'CREATE TRIGGER {SQLITE_SEARCH_TABLE}_delete AFTER DELETE ON auth_user BEGIN {DELETE_OLD} END;',
+    f'CREATE TRIGGER {SQLITE_SEARCH_TABLE}_update AFTER UPDATE OF {COLUMNS} ON auth_user '
+    f'BEGIN {DELETE_OLD} {INSERT_NEW} END;',
+    f"INSERT INTO {SQLITE_SEARCH_TABLE}({SQLITE_SEARCH_TABLE}) VALUES ('rebuild');",
+]
+SQLITE_REVERSE_SQL = [
+    *(f'DROP TRIGGER {SQLITE_SEARCH_TABLE}_{event};' for event in ('insert', 'delete', 'update')),
+    f'DROP TABLE {SQLITE_SEARCH_TABLE};',
+    *(f'DROP INDEX users_auth_user_{field}_lower_idx;' for field in SEARCH_FIELDS),
+]
+
+
+def run_vendor_sql(postgresql, sqlite):
+    def run(apps, schema_editor):
+        statements = {'postgresql': postgresql, 'sqlite': sqlite}.get(schema_editor.connection.vendor, [])
+        for statement in statements:
+            schema_editor.execute(statement, params=None)
+    return run
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0001_user_list_indexes'),
+    ]
+
+    operations = [
+        migrations.RunPython(
+            run_vendor_sql(POSTGRESQL_SQL, SQLITE_SQL),
+            run_vendor_sql(POSTGRESQL_REVERSE_SQL, SQLITE_REVERSE_SQL),
+        ),
+    ]
@@ -0,0 +1,129 @@
+import json
+from base64 import b64decode, b64encode
+from functools import reduce
+
+from django.core.exceptions import ValidationError as DjangoValidationError
+from django.db.models import Q
+from rest_framework.exceptions import NotFound, ValidationError
+from rest_framework.pagination import CursorPagination
+from rest_framework.utils.urls import replace_query_param
+
+
+class KeysetCursorPagination(CursorPagination):
+    """Cursor pagination over the requested ordering field, with the primary key as the tie breaker
+    unless the field is unique.
+
+    The cursor keeps the values of these fields of the last row, so every page is a range scan of
+    the (field, id) index however many rows share a value and however deep the page is.
+    """
+    ordering = 'id'
+    page_size = 50
+    page_size_query_param = 'page_size'
+    max_page_size = 500
+    tie_breaker = 'id'
+
+    def get_ordering(self, request, queryset, view):
+        ordering = super().get_ordering(request, queryset, view)
+        if len(ordering) > 1:
+            # Only single fields have a (field, id) index to seek
+            raise ValidationError({"ordering": ["Ordering by more than one field is not supported"]})
+        field = ordering[0]
+        if queryset.model._meta.get_field(field.lstrip('-')).unique:
+            return (field,)
+        return (field, f'-{self.tie_breaker}' if field.startswith('-') else self.tie_breaker)
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.page_size = self.get_page_size(request)
+        if not self.page_size:
+            return None
+
+        self.base_url = request.build_absolute_uri()
+        self.ordering = self.get_ordering(request, queryset, view)
+        self.cursor = self.decode_cursor(request)
+        reverse, position = self.cursor if self.cursor is not None else (False, None)
+        if position is not None:
+            position = self._to_python(queryset.model, position)
+
+        ordering = [_invert(field) for field in self.ordering] if reverse else list(self.ordering)
+        queryset = queryset.order_by(*ordering)
+        if position is not None:
+            queryset = queryset.filter(_after(ordering, position))
+
+        results = list(queryset[:self.page_size + 1])
+        self.page = results[:self.page_size]
+        has_more = len(results) > self.page_size
+        if reverse:
+            self.page.reverse()
+            self.has_next, self.has_previous = position is not None, has_more
+        else:
+            self.has_next, self.has_previous = has_more, position is not None
+        return self.page
+
+    def _to_python(self, model, position):
+        """Converts the values of a decoded cursor to the types of the ordering fields."""
+        values = []
+        for field, value in zip(self.ordering, position):
+            if value is None or isinstance(value, (dict, list)):
+                raise NotFound(self.invalid_cursor_message)
+            try:
+                values.append(model._meta.get_field(field.lstrip('-')).to_python(value))
+            except (DjangoValidationError, TypeError):
+                raise NotFound(self.invalid_cursor_message)
+        return values
+
+    def _get_row_position(self, instance):
+        return [getattr(instance, field.lstrip('-')) for field in self.ordering]
+
+    def get_next_link(self):
+        if not self.has_next:
+            return None
+        position = self._get_row_position(self.page[-1]) if self.page else self.cursor[1]
+        return self.encode_cursor((False, position))
+
+    def get_previous_link(self):
+        if not self.has_previous:
+            return None
+        position = self._get_row_position(self.page[0]) if self.page else self.cursor[1]
+        return self.encode_cursor((True, position))
+
+    def decode_cursor(self, request):
+        encoded = request.query_params.get(self.cursor_query_param)
+        if encoded is None:
+            return None
+
+        try:
+            cursor = json.loads(b64decode(encoded.encode('ascii')).decode('utf-8'))
+            reverse, position = bool(cursor['r']), cursor['p']
+        except (TypeError, ValueError, KeyError):
+            raise NotFound(self.invalid_cursor_message)
+        if not isinstance(position, list) or len(position) != len(self.ordering):
+            raise NotFound(self.invalid_cursor_message)
+        return reverse, position
+
+    def encode_cursor(self, cursor):
+        reverse, position = cursor
+        encoded = b64encode(json.dumps({'r': int(reverse), 'p': position}).encode('utf-8')).decode('ascii')
+        return replace_query_param(self.base_url, self.cursor_query_param, encoded)
+
+
+def _invert(field):
+    return field[1:] if field.startswith('-') else f'-{field}'
+
+
+def _after(ordering, position):
+    """Returns the condition of the rows following the position in the ordering, (a, b) > (x, y) expanded.
+
+    The bound on the first field alone is redundant but lets the database seek the index instead of scanning it.
+    """
+    conditions = []
+    for index, field in enumerate(ordering):
+        name = field.lstrip('-')
+        lookup = f'{name}__lt' if field.startswith('-') else f'{name}__gt'
+        equal = {other.lstrip('-'): value for other, value in zip(ordering[:index], position)}
+        conditions.append(Q(**equal, **{lookup: position[index]}))
+    condition = reduce(lambda left, right: left | right, conditions)
+    if len(ordering) == 1:
+        return condition
+    first = ordering[0]
+    bound = f'{first.lstrip("-")}__lte' if first.startswith('-') else f'{first}__gte'
+    return Q(**{bound: position[0]}) & condition
@@ -0,0 +1,61 @@
+from functools import reduce
+
+from django.db import connections
+from django.db.models import Q, Value
+from django.db.models.expressions import RawSQL
+from django.db.models.functions import Concat, Lower
+
+SEARCH_FIELDS = ('username', 'email', 'first_name', 'last_name')
+# Trigram indexes only serve terms of at least three characters
+TRIGRAM_LENGTH = 3
+SQLITE_SEARCH_TABLE = 'users_user_search'
+MAX_CHAR = chr(0x10FFFF)
+
+
+def filter_prefix(queryset, field, prefix):
+    """Filters the rows whose field starts with the prefix ignoring case, served by the lower(field) index."""
+    queryset = _alias_lower(queryset)
+    return queryset.filter(_prefix_condition(connections[queryset.db].vendor, field, prefix))
+
+
+def search_users(queryset, query):
+    """Filters the users that match every term of the query in their username, email or names.
+
+    Terms of three characters or more match anywhere in a field through trigram indexes, the PostgreSQL
+    pg_trgm ones or the SQLite FTS5 table. Shorter terms only match the start of a field.
+    """
+    queryset = _alias_lower(queryset)
+    vendor = connections[queryset.db].vendor
+    terms = query.split()
+    for term in terms:
+        if len(term) < TRIGRAM_LENGTH:
+            queryset = queryset.filter(_any_field(_prefix_condition(vendor, field, term) for field in SEARCH_FIELDS))
+        elif vendor == 'postgresql':
+            queryset = queryset.filter(_any_field(Q(**{f'{field}_lower__contains': Lower(Value(term))})
+                                                  for field in SEARCH_FIELDS))
+        elif vendor != 'sqlite':
+            queryset = queryset.filter(_any_field(Q(**{f'{field}__icontains': term}) for field in SEARCH_FIELDS))
+
+    phrases = [term for term in terms if len(term) >= TRIGRAM_LENGTH]
+    if vendor == 'sqlite' and phrases:
+        match = ' AND '.join('"{}"'.format(term.replace('"', '""')) for term in phrases)
+        queryset = queryset.filter(pk__in=RawSQL(
+            f'SELECT rowid FROM {SQLITE_SEARCH_TABLE} WHERE {SQLITE_SEARCH_TABLE} MATCH %s', [match]))
+    return queryset
+
+
+def _alias_lower(queryset):
+    # Filtering on the aliases keeps the exact form of the lower(field) index expressions
+    return queryset.alias(**{f'{field}_lower': Lower(field) for field in SEARCH_FIELDS})
+
+
+def _prefix_condition(vendor, field, prefix):
+    prefix = Lower(Value(prefix))
+    if vendor == 'sqlite':
+        # SQLite only uses an expression index for comparisons, not for LIKE
+        return Q(**{f'{field}_lower__gte': prefix, f'{field}_lower__lt': Concat(prefix, Value(MAX_CHAR))})
+    return Q(**{f'{field}_lower__startswith': prefix})
+
+
+def _any_field(conditions):
+    return reduce(lambda left, right: left | right, conditions)
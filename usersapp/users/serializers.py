@@ -1,8 +1,86 @@
 from django.contrib.auth.models import User
 from rest_framework import serializers
+from rest_framework.validators import UniqueValidator
+
+from .hashing import hash_passwords
+
+BATCH_SIZE = 500
+
+
+class UserListSerializer(serializers.ListSerializer):
+    """Writes many users with bulk queries, hashing their passwords in a process pool.
+
+    The usernames of all rows are checked against the database with one query, instead of the unique
+    validator of every row. When updating, the instance is the list of users in the order of the rows.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        username = self.child.fields['username']
+        username.validators = [validator for validator in username.validators
+                               if not isinstance(validator, UniqueValidator)]
+
+    def to_internal_value(self, data):
+        rows = super().to_internal_value(data)
+        # New rows own their usernames under keys that match nothing else
+        owners_of_rows = ([db_user.id for db_user in self.instance] if self.instance is not None
+                          else [object() for _ in rows])
+        owners = dict(User.objects
+                      .filter(username__in=[row['username'] for row in rows if 'username' in row])
+                      .values_list('username', 'id'))
+        message = User._meta.get_field('username').error_messages['unique']
+        errors = []
+        for row, owner in zip(rows, owners_of_rows):
+            username = row.get('username')
+            if username is not None and owners.setdefault(username, owner) != owner:
+                # Taken by a saved user or by an earlier row
+                errors.append({'username': [message]})
+            else:
+                errors.append({})
+        if any(errors):
+            raise serializers.ValidationError(errors)
+        return rows
+
+    def create(self, validated_data):
+        passwords = hash_passwords([row.get('password') for row in validated_data])
+        db_users = [User(**{**row, 'password': password}) for row, password in zip(validated_data, passwords)]
+        return User.objects.bulk_create(db_users, batch_size=BATCH_SIZE)
+
+    def update(self, instance, validated_data):
+        rows = [row for row in validated_data if 'password' in row]
+        passwords = dict(zip(map(id, rows), hash_passwords([row['password'] for row in rows])))
+        fields = set()
+        for db_user, row in zip(instance, validated_data):
+            for field, value in row.items():
+                setattr(db_user, field, passwords[id(row)] if field == 'password' else value)
+            fields.update(row)
+        if fields:
+            User.objects.bulk_update(instance, sorted(fields), batch_size=BATCH_SIZE)
+        return instance
 
 
 class UserSerializer(serializers.ModelSerializer):
+    password = serializers.CharField(write_only=True, required=False, style={'input_type': 'password'})
+
     class Meta:
         model = User
-        fields = ('id', 'username', 'email', 'first_name', 'last_name')
+        fields = ('id', 'username', 'email', 'first_name', 'last_name', 'password')
+        list_serializer_class = UserListSerializer
+
+    def create(self, validated_data):
+        password = validated_data.pop('password', None)
+        db_user = User(**validated_data)
+        db_user.set_password(password)
+        db_user.save()
+        return db_user
+
+    def update(self, instance, validated_data):
+        password = validated_data.pop('password', None)
+        if password is not None:
+            instance.set_password(password)
+        return super().update(instance, validated_data)
+
+
+class BulkDeleteResultSerializer(serializers.Serializer):
+    id = serializers.IntegerField(read_only=True)
+    deleted = serializers.BooleanField(read_only=True)
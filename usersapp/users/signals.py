@@ -0,0 +1,27 @@
+from django.contrib.auth.models import User
+from django.db.models.signals import m2m_changed, post_delete, post_save
+from django.dispatch import receiver
+from rest_framework.authtoken.models import Token
+from shared.authentication import invalidate_user_tokens
+
+
+@receiver(post_save, sender=Token)
+@receiver(post_delete, sender=Token)
+def invalidate_token(instance, **kwargs):
+    # Logging out and rotating a token delete the old one
+    invalidate_user_tokens(instance.user_id)
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def invalidate_user(instance, **kwargs):
+    invalidate_user_tokens(instance.id)
+
+
+@receiver(m2m_changed, sender=User.groups.through)
+def invalidate_user_groups(instance, action, reverse, pk_set, **kwargs):
+    if action not in ("post_add", "post_remove", "pre_clear"):
+        return
+    user_ids = (pk_set or instance.user_set.values_list("id", flat=True)) if reverse else [instance.id]
+    for user_id in user_ids:
+        invalidate_user_tokens(user_id)
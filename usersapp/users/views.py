@@ -1,17 +1,113 @@
+from collections import Counter
+
 from django.contrib.auth.models import User
+from django.db import transaction
 from django_filters import rest_framework
-from rest_framework import filters, viewsets
+from drf_spectacular.utils import extend_schema
+from rest_framework import filters, serializers, status, viewsets
+from rest_framework.decorators import action
+from rest_framework.parsers import JSONParser
 from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+from shared.authentication import invalidate_user_tokens
+from shared.parsers import NDJSONParser
 
 from .filters import UserFilter
-from .serializers import UserSerializer
+from .pagination import KeysetCursorPagination
+from .serializers import BATCH_SIZE, BulkDeleteResultSerializer, UserSerializer
+
+
+def invalidate_users_tokens(user_ids):
+    for user_id in user_ids:
+        invalidate_user_tokens(user_id)
 
 
 class UserViewSet(viewsets.ModelViewSet):
     queryset = User.objects.all()
     serializer_class = UserSerializer
     permission_classes = [IsAuthenticated]
+    pagination_class = KeysetCursorPagination
     filter_backends = (rest_framework.DjangoFilterBackend, filters.OrderingFilter,)
     filterset_class = UserFilter
-    ordering_fields = '__all__'
+    # Only the indexed columns, see the 0001_user_list_indexes migration
+    ordering_fields = ('id', 'username', 'email', 'first_name', 'last_name')
+    ordering = ('id',)
+
+    @extend_schema(
+        methods=["POST"],
+        operation_id="users_bulk_create",
+        summary="Method creates many users at once, from a JSON array or an NDJSON stream",
+        request=UserSerializer(many=True),
+        responses={"201": UserSerializer(many=True)},
+    )
+    @action(detail=False,
+        methods=["POST"],
+        url_path='bulk',
+        parser_classes=[JSONParser, NDJSONParser],
+    )
+    def bulk_create(self, request):
+        if not isinstance(request.data, list):
+            return Response(data={"detail": "Expected a list of users"}, status=status.HTTP_400_BAD_REQUEST)
+
+        serializer = UserSerializer(data=request.data, many=True)
+        serializer.is_valid(raise_exception=True)
+        with transaction.atomic():
+            db_users = serializer.save()
+
+        return Response(data=UserSerializer(db_users, many=True).data, status=status.HTTP_201_CREATED)
+
+    @extend_schema(
+        methods=["PATCH"],
+        operation_id="users_bulk_update",
+        summary="Method updates many users at once, each row has the id of the user it changes",
+        request=UserSerializer(many=True),
+        responses={"200": UserSerializer(many=True)},
+    )
+    @bulk_create.mapping.patch
+    def bulk_update(self, request):
+        if not isinstance(request.data, list) or not all(isinstance(row, dict) for row in request.data):
+            return Response(data={"detail": "Expected a list of users"}, status=status.HTTP_400_BAD_REQUEST)
+
+        ids = [row.get('id') if isinstance(row.get('id'), int) else None for row in request.data]
+        db_users = User.objects.in_bulk([user_id for user_id in ids if user_id is not None])
+        counts = Counter(ids)
+        errors = [{"id": ["User not found"]} if user_id not in db_users
+                  else {"id": ["User is repeated"]} if counts[user_id] > 1
+                  else {}
+                  for user_id in ids]
+        if any(errors):
+            return Response(data=errors, status=status.HTTP_400_BAD_REQUEST)
+
+        serializer = UserSerializer([db_users[user_id] for user_id in ids], data=request.data, many=True, partial=True)
+        serializer.is_valid(raise_exception=True)
+        with transaction.atomic():
+            db_users = serializer.save()
+            # bulk_update sends no post_save, so the cached tokens are dropped here. Only after the commit,
+            # a request in between would cache the users as they were under the new versions
+            user_ids = [db_user.id for db_user in db_users]
+            transaction.on_commit(lambda: invalidate_users_tokens(user_ids))
+
+        return Response(data=UserSerializer(db_users, many=True).data, status=status.HTTP_200_OK)
+
+    @extend_schema(
+        methods=["DELETE"],
+        operation_id="users_bulk_delete",
+        summary="Method deletes the users with the given ids",
+        request=serializers.ListField(child=serializers.IntegerField()),
+        responses={"200": BulkDeleteResultSerializer(many=True)},
+    )
+    @bulk_create.mapping.delete
+    def bulk_delete(self, request):
+        field = serializers.ListField(child=serializers.IntegerField())
+        ids = field.run_validation(request.data)
+
+        with transaction.atomic():
+            deleted = set()
+            for start in range(0, len(ids), BATCH_SIZE):
+                batch = User.objects.filter(id__in=ids[start:start + BATCH_SIZE])
+                deleted.update(batch.values_list('id', flat=True))
+                batch.delete()
 
+        return Response(data=BulkDeleteResultSerializer([{"id": user_id, "deleted": user_id in deleted}
+                                                         for user_id in ids], many=True).data,
+                        status=status.HTTP_200_OK)
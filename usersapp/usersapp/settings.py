@@ -10,11 +10,19 @@ For the full list of settings and their values, see
 https://docs.djangoproject.com/en/3.2/ref/settings/
 """
 
+import os
+import sys
 from pathlib import Path
 
+import django
+from django.core.exceptions import ImproperlyConfigured
+
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
 BASE_DIR = Path(__file__).resolve().parent.parent
 
+# The modules shared with the other project of the repository, see shared/
+sys.path.append(str(BASE_DIR.parent))
+
 
 # Quick-start development settings - unsuitable for production
 # See https://docs.djangoproject.com/en/3.2/howto/deployment/checklist/
@@ -55,9 +63,35 @@ REST_FRAMEWORK = {
     'DEFAULT_PARSER_CLASSES': [
         'rest_framework.parsers.JSONParser',
     ],
+    'DEFAULT_AUTHENTICATION_CLASSES': [
+        'rest_framework.authentication.SessionAuthentication',
+        'shared.authentication.CachedTokenAuthentication',
+        'rest_framework.authentication.BasicAuthentication',
+    ],
     "DEFAULT_SCHEMA_CLASS": "drf_spectacular.openapi.AutoSchema",
 }
 
+# Tokens cached by each process and the seconds they are trusted without checking the database
+TOKEN_CACHE_SIZE = 10000
+TOKEN_CACHE_TTL = 60
+# Prefix of the cached versions of the users, whose bump drops their cached tokens
+TOKEN_CACHE_KEY_PREFIX = 'users:auth'
+
+# Processes hashing the passwords of bulk user writes, one per core by default
+PASSWORD_HASH_WORKERS = int(os.environ.get('PASSWORD_HASH_WORKERS', '0')) or None
+
+# Revoking a cached token is announced through the cache, so every worker process must share it
+# in production (e.g. REDIS_URL=redis://localhost:6379/0)
+REDIS_URL = os.environ.get('REDIS_URL')
+
+if REDIS_URL:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': REDIS_URL,
+        }
+    }
+
 MIDDLEWARE = [
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
@@ -102,10 +136,77 @@ USE_TZ = True
 STATIC_URL = '/static/'
 STATIC_ROOT = 'static'
 
-DATABASES = {
-    'default': {
-        'ENGINE': 'django.db.backends.sqlite3',
-        'NAME': BASE_DIR / 'db.sqlite3',
+# The database is chosen with DATABASE_PROFILE:
+#   sqlite        - a local SQLite file for development (default)
+#   sqlite-tuned  - SQLite in WAL mode with a busy timeout, for single-node deployments
+#   postgresql    - PostgreSQL with persistent, health-checked connections, configured with
+#                   DATABASE_NAME, DATABASE_USER, DATABASE_PASSWORD, DATABASE_HOST and DATABASE_PORT.
+#                   DATABASE_POOL=1 switches to the psycopg connection pool, which needs Django 5.1+
+DATABASE_PROFILE = os.environ.get('DATABASE_PROFILE', 'sqlite')
+
+if DATABASE_PROFILE == 'postgresql':
+    DATABASES = {
+        'default': {
+            'ENGINE': 'django.db.backends.postgresql',
+            'NAME': os.environ.get('DATABASE_NAME', 'usersapp'),
+            'USER': os.environ.get('DATABASE_USER', ''),
+            'PASSWORD': os.environ.get('DATABASE_PASSWORD', ''),
+            'HOST': os.environ.get('DATABASE_HOST', ''),
+            'PORT': os.environ.get('DATABASE_PORT', ''),
+            'CONN_MAX_AGE': int(os.environ.get('DATABASE_CONN_MAX_AGE', '60')),
+            'CONN_HEALTH_CHECKS': True,
+            'OPTIONS': {},
+        }
     }
-}
+    if os.environ.get('DATABASE_POOL'):
+        if django.VERSION < (5, 1):
+            raise ImproperlyConfigured("DATABASE_POOL needs Django 5.1+, use a pooler such as PgBouncer instead")
+        # Pooled connections go back to the pool after every request instead of staying open
+        DATABASES['default']['CONN_MAX_AGE'] = 0
+        DATABASES['default']['OPTIONS']['pool'] = {
+            'min_size': int(os.environ.get('DATABASE_POOL_MIN_SIZE', '2')),
+            'max_size': int(os.environ.get('DATABASE_POOL_MAX_SIZE', '20')),
+        }
+elif DATABASE_PROFILE in ('sqlite', 'sqlite-tuned'):
+    DATABASES = {
+        'default': {
+            'ENGINE': 'django.db.backends.sqlite3',
+            'NAME': os.environ.get('DATABASE_NAME', BASE_DIR / 'db.sqlite3'),
+        }
+    }
+    if DATABASE_PROFILE == 'sqlite-tuned':
+        # Seconds a writer waits for the database lock before failing
+        DATABASES['default']['OPTIONS'] = {'timeout': 20}
+        # Applied to every new connection, see shared.db
+        SQLITE_PRAGMAS = {
+            'journal_mode': 'WAL',
+            'synchronous': 'NORMAL',
+            'mmap_size': 256 * 1024 * 1024,
+            'temp_store': 'MEMORY',
+        }
+else:
+    raise ImproperlyConfigured(f"Unknown DATABASE_PROFILE {DATABASE_PROFILE!r}")
+
+# Read-only requests are served from a replica when DATABASE_REPLICA_HOST (postgresql) or
+# DATABASE_REPLICA_NAME (sqlite) is set. Writes, and the reads of a client that has written
+# within the last REPLICA_STICKY_SECONDS, stay on the primary
+if DATABASE_PROFILE == 'postgresql' and os.environ.get('DATABASE_REPLICA_HOST'):
+    DATABASES['replica'] = {
+        **DATABASES['default'],
+        'HOST': os.environ['DATABASE_REPLICA_HOST'],
+        'PORT': os.environ.get('DATABASE_REPLICA_PORT', DATABASES['default']['PORT']),
+        'TEST': {'MIRROR': 'default'},
+    }
+elif DATABASE_PROFILE != 'postgresql' and os.environ.get('DATABASE_REPLICA_NAME'):
+    DATABASES['replica'] = {
+        **DATABASES['default'],
+        'NAME': os.environ['DATABASE_REPLICA_NAME'],
+        'TEST': {'MIRROR': 'default'},
+    }
+
+if 'replica' in DATABASES:
+    DATABASE_ROUTERS = ['shared.routers.ReplicaRouter']
+    MIDDLEWARE.insert(0, 'shared.routers.ReplicaRoutingMiddleware')
+
+REPLICA_STICKY_SECONDS = int(os.environ.get('DATABASE_REPLICA_STICKY_SECONDS', '10'))
 